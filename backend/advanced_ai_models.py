@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Tuple
 import threading
 import time
+import random
 import psutil
 
 class AdvancedAIPredictor:
@@ -267,7 +268,7 @@ class DriverBehaviorModel:
         fatigue = min(1.0, fatigue_factor + (100 - alertness * 100) / 200)
         
         # Driving pattern analysis
-        driving_pattern = self._analyze_driving_pattern(cpu_usage, network_activity)
+        driving_pattern = self._analyze_driving_pattern(cpu_usage, network_activity, behavior_data.get('history', []))
         
         analysis = {
             "alertness_score": round(alertness, 2),
@@ -285,7 +286,8 @@ class DriverBehaviorModel:
             
         return analysis
     
-    def _analyze_driving_pattern(self, cpu_usage: float, network_activity: int) -> Dict[str, Any]:
+    def _analyze_driving_pattern(self, cpu_usage: float, network_activity: int,
+                                 history: List[Dict[str, Any]]) -> Dict[str, Any]:
         # High CPU usage = aggressive driving simulation
         if cpu_usage > 80:
             pattern = "AGGRESSIVE"
@@ -300,9 +302,18 @@ class DriverBehaviorModel:
         return {
             "pattern_type": pattern,
             "aggressiveness_score": score,
-            "consistency": round(random.uniform(0.6, 0.9), 2)
+            "consistency": self._calculate_consistency(history)
         }
     
+    def _calculate_consistency(self, history: List[Dict[str, Any]]) -> float:
+        # Steady system load over the recent window = consistent driving
+        cpu_values = [sample.get('cpu_usage', 0) for sample in history]
+        if len(cpu_values) < 3:
+            return round(random.uniform(0.6, 0.9), 2)
+        mean = sum(cpu_values) / len(cpu_values)
+        deviation = (sum((value - mean) ** 2 for value in cpu_values) / len(cpu_values)) ** 0.5
+        return round(max(0.0, min(1.0, 1.0 - deviation / 50)), 2)
+    
     def _get_behavior_recommendations(self, alertness: float, stress: float, fatigue: float) -> List[str]:
         recommendations = []
         
@@ -422,6 +433,3 @@ class EmotionAnalysisModel:
         }
         
         return adjustments.get(emotion, ["No adjustments needed"])
-
-# Global AI predictor instance
-ai_predictor = AdvancedAIPredictor()
\ No newline at end of file
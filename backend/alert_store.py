@@ -0,0 +1,195 @@
+import bisect
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+INDEXED_FIELDS = ('severity', 'type', 'vehicle_id')
+
+class SeqIndex:
+    """Ascending alert sequence numbers for one index value.
+
+    Evicted entries are always the oldest, so they are dropped by moving
+    `start` forward and the list is compacted once half of it is dead.
+    """
+
+    def __init__(self):
+        self.seqs: List[int] = []
+        self.start = 0
+
+    def __len__(self) -> int:
+        return len(self.seqs) - self.start
+
+    def append(self, seq: int):
+        self.seqs.append(seq)
+
+    def evict(self, seq: int):
+        if self.start < len(self.seqs) and self.seqs[self.start] == seq:
+            self.start += 1
+            if self.start > 1024 and self.start * 2 > len(self.seqs):
+                del self.seqs[:self.start]
+                self.start = 0
+
+    def newest_first(self, lo_seq: int, hi_seq: int) -> Iterator[int]:
+        """Indexed seqs in [lo_seq, hi_seq), newest first, without copying"""
+        left = bisect.bisect_left(self.seqs, lo_seq, self.start)
+        right = bisect.bisect_left(self.seqs, hi_seq, self.start)
+        for position in range(right - 1, left - 1, -1):
+            yield self.seqs[position]
+
+class AlertStore:
+    """Bounded emergency alert history with per-field and time indexes.
+
+    Alerts live in a fixed-size ring addressed by sequence number; once
+    `max_alerts` are held the oldest is evicted. Sequence numbers come from
+    the shared alert stream, so cursors are valid on every worker. Time
+    queries bisect the ring (arrival times are clamped to be non-decreasing)
+    and field filters start from the smallest matching index, so a page
+    costs O(log n + page) rather than a scan of the history.
+    """
+
+    def __init__(self, max_alerts: int = 100000):
+        self.max_alerts = max_alerts
+        self.evicted = 0
+        self.lock = threading.Lock()
+        self._clear()
+
+    def _clear(self):
+        self.slots: List[Optional[Dict[str, Any]]] = [None] * self.max_alerts
+        self.times: List[float] = [0.0] * self.max_alerts
+        self.first_seq = 1
+        self.next_seq = 1
+        self.indexes: Dict[str, Dict[Any, SeqIndex]] = {field: {} for field in INDEXED_FIELDS}
+
+    def __len__(self) -> int:
+        return self.next_seq - self.first_seq
+
+    @staticmethod
+    def parse_time(value: Any) -> Optional[float]:
+        if value is None or value == '':
+            return None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return datetime.fromisoformat(str(value)).timestamp()
+
+    def add(self, seq: int, alert: Dict[str, Any]) -> bool:
+        """Store an alert under its stream sequence number; older or duplicate seqs are ignored"""
+        with self.lock:
+            if seq < self.next_seq:
+                return False
+            if seq - self.next_seq >= self.max_alerts:
+                # Everything held would be evicted by the gap anyway
+                self.evicted += len(self)
+                self._clear()
+            if len(self) and seq > self.next_seq:
+                # Gap in the stream (retention on the backend side): keep the ring contiguous
+                for missing in range(self.next_seq, seq):
+                    self._append(missing, None)
+            elif not len(self):
+                self.first_seq = self.next_seq = seq
+            self._append(seq, alert)
+            return True
+
+    def _append(self, seq: int, alert: Optional[Dict[str, Any]]):
+        if len(self) >= self.max_alerts:
+            self._evict_oldest()
+        slot = seq % self.max_alerts
+        previous = self.times[(seq - 1) % self.max_alerts] if len(self) else 0.0
+        try:
+            timestamp = self.parse_time(alert.get('timestamp')) if alert else None
+        except ValueError:
+            timestamp = None
+        stored = None
+        if alert:
+            # Indexed values are client-supplied: keep them as strings so any value is hashable
+            stored = dict(alert, seq=seq)
+            for field in INDEXED_FIELDS:
+                if stored.get(field) is not None:
+                    stored[field] = str(stored[field])
+        self.slots[slot] = stored
+        self.times[slot] = max(previous, timestamp or previous)
+        self.next_seq = seq + 1
+        if stored:
+            for field in INDEXED_FIELDS:
+                value = stored.get(field)
+                if value is not None:
+                    self.indexes[field].setdefault(value, SeqIndex()).append(seq)
+
+    def _evict_oldest(self):
+        seq = self.first_seq
+        slot = seq % self.max_alerts
+        alert = self.slots[slot]
+        if alert:
+            for field in INDEXED_FIELDS:
+                index = self.indexes[field].get(alert.get(field))
+                if index is not None:
+                    index.evict(seq)
+                    if not len(index):
+                        del self.indexes[field][alert.get(field)]
+        self.slots[slot] = None
+        self.first_seq += 1
+        self.evicted += 1
+
+    def _seq_for_time(self, timestamp: float) -> int:
+        """First retained seq whose time is >= timestamp"""
+        lo, hi = self.first_seq, self.next_seq
+        while lo < hi:
+            middle = (lo + hi) // 2
+            if self.times[middle % self.max_alerts] < timestamp:
+                lo = middle + 1
+            else:
+                hi = middle
+        return lo
+
+    def query(self, severity: Optional[str] = None, alert_type: Optional[str] = None,
+              vehicle_id: Optional[str] = None, since: Any = None, until: Any = None,
+              cursor: Optional[int] = None, limit: int = 50) -> Dict[str, Any]:
+        """Newest-first page of matching alerts; pass `next_cursor` back to continue"""
+        limit = max(1, min(limit, 1000))
+        filters = {field: value for field, value in
+                   (('severity', severity), ('type', alert_type), ('vehicle_id', vehicle_id)) if value is not None}
+        with self.lock:
+            lo_seq = self.first_seq
+            hi_seq = self.next_seq
+            since_ts, until_ts = self.parse_time(since), self.parse_time(until)
+            if since_ts is not None:
+                lo_seq = max(lo_seq, self._seq_for_time(since_ts))
+            if until_ts is not None:
+                hi_seq = min(hi_seq, self._seq_for_time(until_ts + 1e-6))
+            if cursor is not None:
+                hi_seq = min(hi_seq, int(cursor))
+
+            candidates: Iterable[int] = range(hi_seq - 1, lo_seq - 1, -1)
+            if filters:
+                indexes = [self.indexes[field].get(value) for field, value in filters.items()]
+                if any(index is None for index in indexes):
+                    candidates = ()
+                else:
+                    candidates = min(indexes, key=len).newest_first(lo_seq, hi_seq)
+
+            alerts: List[Dict[str, Any]] = []
+            next_cursor = None
+            for seq in candidates:
+                alert = self.slots[seq % self.max_alerts]
+                if alert is None or any(alert.get(field) != value for field, value in filters.items()):
+                    continue
+                if len(alerts) == limit:
+                    next_cursor = alerts[-1]['seq']
+                    break
+                alerts.append(alert)
+        return {'alerts': alerts, 'next_cursor': next_cursor, 'count': len(alerts)}
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'retained': len(self),
+                'max_alerts': self.max_alerts,
+                'evicted': self.evicted,
+                'oldest_seq': self.first_seq if len(self) else None,
+                'newest_seq': self.next_seq - 1 if len(self) else None,
+                'index_sizes': {field: len(values) for field, values in self.indexes.items()}
+            }
+
+# Global alert store instance
+alert_store = AlertStore(max_alerts=int(os.environ.get('AETHER_ALERT_RETENTION', '100000')))
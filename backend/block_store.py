@@ -0,0 +1,326 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional
+
+from blockchain_security import Block
+
+# index, timestamp, nonce, previous_hash, hash, data length; then the data (compact JSON) and a CRC32
+RECORD_HEADER = struct.Struct('<QdQ32s32sI')
+RECORD_CRC = struct.Struct('<I')
+ZERO_HASH = bytes(32)
+
+def encode_block(block: Block) -> bytes:
+    data = json.dumps(block.data, separators=(',', ':')).encode()
+    # Only the genesis block links to the non-hash "0"
+    previous = ZERO_HASH if block.previous_hash == "0" else bytes.fromhex(block.previous_hash)
+    body = RECORD_HEADER.pack(block.index, block.timestamp, block.nonce, previous,
+                              bytes.fromhex(block.hash), len(data)) + data
+    return body + RECORD_CRC.pack(zlib.crc32(body))
+
+def decode_block(buffer, offset: int = 0) -> Optional[Block]:
+    """The block encoded at `offset`, or None if the record is truncated or corrupt"""
+    if offset + RECORD_HEADER.size > len(buffer):
+        return None
+    index, timestamp, nonce, previous, block_hash, data_length = RECORD_HEADER.unpack_from(buffer, offset)
+    end = offset + RECORD_HEADER.size + data_length
+    if end + RECORD_CRC.size > len(buffer):
+        return None
+    body = buffer[offset:end]
+    if zlib.crc32(body) != RECORD_CRC.unpack_from(buffer, end)[0]:
+        return None
+    return Block.from_dict({
+        "index": index,
+        "timestamp": timestamp,
+        "data": json.loads(body[RECORD_HEADER.size:]),
+        "previous_hash": "0" if index == 0 and previous == ZERO_HASH else previous.hex(),
+        "nonce": nonce,
+        "hash": block_hash.hex()
+    })
+
+def record_size(buffer, offset: int) -> int:
+    return RECORD_HEADER.size + RECORD_HEADER.unpack_from(buffer, offset)[5] + RECORD_CRC.size
+
+class Segment:
+    """One append-only data file plus its offset index (8 bytes per block)"""
+
+    def __init__(self, data_path: Path, index_path: Path):
+        self.data_path = data_path
+        self.index_path = index_path
+        self.offsets = array('Q')
+        self.size = 0
+        self.mm: Optional[mmap.mmap] = None
+        self.reader = None
+        self.data_file = None
+        self.index_file = None
+
+    def recover(self):
+        """Load the offset index and reconcile it with the data file after a crash:
+        drop index entries past the data, index records written after the index,
+        and cut off a torn final record"""
+        self.data_path.touch()
+        self.size = self.data_path.stat().st_size
+        if self.index_path.exists():
+            raw = self.index_path.read_bytes()
+            self.offsets.frombytes(raw[:len(raw) - len(raw) % self.offsets.itemsize])
+        self._map(self.size)
+        while self.offsets and (self.mm is None or decode_block(self.mm, self.offsets[-1]) is None):
+            self.offsets.pop()
+        end = self.offsets[-1] + record_size(self.mm, self.offsets[-1]) if self.offsets else 0
+        while end < self.size and decode_block(self.mm, end) is not None:
+            self.offsets.append(end)
+            end += record_size(self.mm, end)
+        if end < self.size:
+            self._unmap()
+            os.truncate(self.data_path, end)
+            self.size = end
+        with open(self.index_path, 'wb') as index_file:
+            index_file.write(self.offsets.tobytes())
+
+    def _map(self, needed: int):
+        if self.mm is not None and len(self.mm) >= needed:
+            return
+        self._unmap()
+        if self.size == 0:
+            return
+        self.reader = open(self.data_path, 'rb')
+        self.mm = mmap.mmap(self.reader.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _unmap(self):
+        if self.mm is not None:
+            self.mm.close()
+            self.reader.close()
+            self.mm = self.reader = None
+
+    def read(self, slot: int) -> Block:
+        offset = self.offsets[slot]
+        self._map(offset + RECORD_HEADER.size)
+        self._map(offset + record_size(self.mm, offset))
+        block = decode_block(self.mm, offset)
+        if block is None:
+            raise IOError(f"Corrupt block record at {self.data_path.name}:{offset}")
+        return block
+
+    def append(self, record: bytes, fsync: bool):
+        if self.data_file is None:
+            self.data_file = open(self.data_path, 'ab')
+            self.index_file = open(self.index_path, 'ab')
+        offset = self.size
+        # Data before index: a crash in between leaves a record that recover() re-indexes
+        self.data_file.write(record)
+        self.data_file.flush()
+        self.index_file.write(struct.pack('<Q', offset))
+        self.index_file.flush()
+        if fsync:
+            os.fsync(self.data_file.fileno())
+            os.fsync(self.index_file.fileno())
+        self.size += len(record)
+        self.offsets.append(offset)
+
+    def close(self):
+        self._unmap()
+        for handle in (self.data_file, self.index_file):
+            if handle is not None:
+                handle.close()
+        self.data_file = self.index_file = None
+
+class BlockStore:
+    """Append-only on-disk ledger that reads like a list of blocks.
+
+    Blocks are stored in segment files of `blocks_per_segment` records, each
+    with an offset index, so block i is found by arithmetic plus one index
+    lookup and decoded straight from a memory-mapped segment. Only the last
+    `cache_size` blocks read or written stay in memory. A checkpoint file
+    records the height already verified so a reopen can skip re-verifying.
+
+    The segment size is fixed when the ledger is created and kept in
+    `ledger.json`; an existing ledger is always reopened with its own size,
+    whatever `blocks_per_segment` asks for. Segment files past the first
+    short segment (left behind when recovery truncates one mid-ledger) are
+    moved to `quarantine/`, so new blocks never land in an existing file.
+    """
+
+    def __init__(self, directory: str, blocks_per_segment: int = 10000, cache_size: int = 1024,
+                 fsync: bool = False):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.blocks_per_segment = blocks_per_segment
+        self.cache_size = cache_size
+        self.fsync = fsync
+        self.lock = threading.RLock()
+        self.cache: 'OrderedDict[int, Block]' = OrderedDict()
+        self.segments: List[Segment] = []
+        self.length = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._open()
+
+    def _segment_paths(self, number: int):
+        return (self.directory / f"segment_{number:06d}.dat", self.directory / f"segment_{number:06d}.idx")
+
+    def _load_meta(self):
+        meta_path = self.directory / 'ledger.json'
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            meta = {}
+        stored = meta.get('blocks_per_segment')
+        if stored is None and self._segment_paths(0)[0].exists():
+            # Written before the meta file existed: a full first segment tells the size,
+            # a lone one only that the size is at least its block count
+            first = Segment(*self._segment_paths(0))
+            first.recover()
+            stored = len(first.offsets)
+            first.close()
+            if not self._segment_paths(1)[0].exists():
+                stored = max(stored, self.blocks_per_segment)
+        if stored and stored != self.blocks_per_segment:
+            print(f"Ledger {self.directory} uses {stored} blocks per segment; "
+                  f"ignoring the configured {self.blocks_per_segment}")
+            self.blocks_per_segment = stored
+        if meta.get('blocks_per_segment') != self.blocks_per_segment:
+            temporary = meta_path.with_suffix('.tmp')
+            temporary.write_text(json.dumps({'blocks_per_segment': self.blocks_per_segment}))
+            os.replace(temporary, meta_path)
+
+    def _open(self):
+        self._load_meta()
+        number = 0
+        while self._segment_paths(number)[0].exists():
+            segment = Segment(*self._segment_paths(number))
+            segment.recover()
+            self.segments.append(segment)
+            self.length += len(segment.offsets)
+            if len(segment.offsets) < self.blocks_per_segment:
+                break
+            number += 1
+        found = {int(path.name[8:14]) for path in self.directory.glob('segment_*')
+                 if path.name[8:14].isdigit()}
+        for orphan in sorted(found):
+            if orphan >= len(self.segments):
+                self._quarantine(orphan)
+
+    def _quarantine(self, number: int):
+        """Move segment files that are not part of the readable ledger out of the way"""
+        target = self.directory / 'quarantine'
+        target.mkdir(exist_ok=True)
+        stamp = int(time.time())
+        for path in self._segment_paths(number):
+            if path.exists():
+                os.replace(path, target / f"{path.name}.{stamp}")
+        print(f"Ledger {self.directory}: moved orphaned segment {number} to {target}")
+
+    def __len__(self) -> int:
+        return self.length
+
+    def _locate(self, index: int) -> int:
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError('block index out of range')
+        return index
+
+    def __getitem__(self, index: int) -> Block:
+        index = self._locate(index)
+        with self.lock:
+            block = self.cache.get(index)
+            if block is not None:
+                self.cache.move_to_end(index)
+                self.cache_hits += 1
+                return block
+            self.cache_misses += 1
+            block = self._read(index)
+            self._remember(index, block)
+            return block
+
+    def _read(self, index: int) -> Block:
+        return self.segments[index // self.blocks_per_segment].read(index % self.blocks_per_segment)
+
+    def _remember(self, index: int, block: Block):
+        self.cache[index] = block
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def __iter__(self) -> Iterator[Block]:
+        return self.scan(0, self.length)
+
+    def scan(self, start: int, stop: int) -> Iterator[Block]:
+        """Blocks start..stop-1 in order without evicting the recent-block cache"""
+        for index in range(start, min(stop, self.length)):
+            with self.lock:
+                block = self.cache.get(index)
+                if block is None:
+                    block = self._read(index)
+            yield block
+
+    def append(self, block: Block):
+        if block.index != self.length:
+            raise ValueError(f"Expected block {self.length}, got {block.index}")
+        record = encode_block(block)
+        with self.lock:
+            if not self.segments or len(self.segments[-1].offsets) >= self.blocks_per_segment:
+                if self.segments:
+                    self.segments[-1].close()
+                paths = self._segment_paths(len(self.segments))
+                if any(path.exists() for path in paths):
+                    self._quarantine(len(self.segments))
+                self.segments.append(Segment(*paths))
+            self.segments[-1].append(record, self.fsync)
+            self._remember(block.index, block)
+            self.length += 1
+
+    def __setitem__(self, index: int, block: Block):
+        """Only a lone genesis block can be replaced (when joining another ledger)"""
+        if self._locate(index) != 0 or self.length != 1:
+            raise ValueError('BlockStore is append-only')
+        with self.lock:
+            self.clear()
+            self.append(block)
+
+    def clear(self):
+        with self.lock:
+            for segment in self.segments:
+                segment.close()
+                segment.data_path.unlink(missing_ok=True)
+                segment.index_path.unlink(missing_ok=True)
+            self.segments.clear()
+            self.cache.clear()
+            self.length = 0
+            self.write_checkpoint({})
+
+    def read_checkpoint(self) -> Dict[str, Any]:
+        try:
+            return json.loads((self.directory / 'checkpoint.json').read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def write_checkpoint(self, checkpoint: Dict[str, Any]):
+        path = self.directory / 'checkpoint.json'
+        temporary = path.with_suffix('.tmp')
+        temporary.write_text(json.dumps(checkpoint))
+        os.replace(temporary, path)
+
+    def close(self):
+        with self.lock:
+            for segment in self.segments:
+                segment.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'directory': str(self.directory),
+                'blocks': self.length,
+                'segments': len(self.segments),
+                'blocks_per_segment': self.blocks_per_segment,
+                'bytes': sum(segment.size for segment in self.segments),
+                'cached_blocks': len(self.cache),
+                'cache_hits': self.cache_hits,
+                'cache_misses': self.cache_misses
+            }
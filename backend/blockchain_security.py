@@ -1,9 +1,16 @@
+import bisect
 import hashlib
 import json
+import os
 import time
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 import threading
+from array import array
+from collections import OrderedDict
+
+from instrumentation import BLOCK_MINING, CHAIN_AUDIT
+from merkle import block_hash, inclusion_proof, leaf_hash, merkle_levels, merkle_root
 
 class Block:
     def __init__(self, index: int, data: Dict[str, Any], previous_hash: str):
@@ -14,29 +21,189 @@ class Block:
         self.nonce = 0
         self.hash = self.calculate_hash()
     
+    def header_data(self) -> Dict[str, Any]:
+        """The part of `data` the hash covers: a Merkle-rooted block commits to its
+        records through the root, so they are left out"""
+        if "merkle_root" in self.data:
+            return {key: value for key, value in self.data.items() if key != "records"}
+        return self.data
+    
+    def header(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "timestamp": self.timestamp,
+            "data": self.header_data(),
+            "previous_hash": self.previous_hash,
+            "nonce": self.nonce,
+            "hash": self.hash
+        }
+    
     def calculate_hash(self) -> str:
-        block_string = json.dumps({
+        return block_hash({
             "index": self.index,
             "timestamp": self.timestamp,
-            "data": self.data,
+            "data": self.header_data(),
             "previous_hash": self.previous_hash,
             "nonce": self.nonce
-        }, sort_keys=True)
-        return hashlib.sha256(block_string.encode()).hexdigest()
+        })
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "timestamp": self.timestamp,
+            "data": self.data,
+            "previous_hash": self.previous_hash,
+            "nonce": self.nonce,
+            "hash": self.hash
+        }
+    
+    @classmethod
+    def from_dict(cls, fields: Dict[str, Any]) -> 'Block':
+        block = cls.__new__(cls)
+        block.__dict__.update(fields)
+        return block
+    
+    def _hash_parts(self) -> Tuple[bytes, bytes]:
+        """The calculate_hash input split around the nonce, byte for byte"""
+        head = (f'{{"data": {json.dumps(self.header_data(), sort_keys=True)}, '
+                f'"index": {json.dumps(self.index)}, "nonce": ')
+        tail = (f', "previous_hash": {json.dumps(self.previous_hash)}, '
+                f'"timestamp": {json.dumps(self.timestamp)}}}')
+        return head.encode(), tail.encode()
     
     def mine_block(self, difficulty: int = 2):
+        # Serialize the data once and resume SHA-256 from the hashed prefix for each nonce
         target = "0" * difficulty
+        head, tail = self._hash_parts()
+        prefix = hashlib.sha256(head)
         while self.hash[:difficulty] != target:
             self.nonce += 1
-            self.hash = self.calculate_hash()
+            digest = prefix.copy()
+            digest.update(str(self.nonce).encode() + tail)
+            self.hash = digest.hexdigest()
+
+class VehicleRecordIndex:
+    """Where one vehicle's records sit in the chain, in append order.
+
+    Parallel arrays of block index, record position inside a batch block
+    (-1 for a single-record block) and block time, 24 bytes per record.
+    Times are clamped to be non-decreasing, so a time window maps to a
+    position range by bisect.
+    """
 
-class AETHERBlockchain:
     def __init__(self):
-        self.chain: List[Block] = [self.create_genesis_block()]
+        self.blocks = array('q')
+        self.records = array('q')
+        self.times = array('d')
+
+    def __len__(self) -> int:
+        # `times` is appended last, so readers never see a half-added entry
+        return len(self.times)
+
+    def append(self, block_index: int, record_position: int, timestamp: float):
+        self.blocks.append(block_index)
+        self.records.append(record_position)
+        self.times.append(max(timestamp, self.times[-1]) if self.times else timestamp)
+    
+    def extend(self, other: 'VehicleRecordIndex'):
+        for position in range(len(other)):
+            self.append(other.blocks[position], other.records[position], other.times[position])
+
+class SeqBlockIndex:
+    """Which block sealed each ingestion seq.
+
+    A group's seqs are contiguous, so one entry per batch block (first
+    seq, block index, record count) maps a receipt seq to its block and
+    position by bisect. Entries only go forward: blocks whose seqs repeat
+    earlier ones are not indexed.
+    """
+
+    def __init__(self):
+        self.first_seqs = array('q')
+        self.blocks = array('q')
+        self.counts = array('q')
+
+    def __len__(self) -> int:
+        # `counts` is appended last, so readers never see a half-added entry
+        return len(self.counts)
+
+    def last_seq(self) -> int:
+        return self.first_seqs[-1] + self.counts[-1] - 1 if len(self) else 0
+
+    def append(self, first_seq: int, block_index: int, count: int):
+        if first_seq > self.last_seq():
+            self.first_seqs.append(first_seq)
+            self.blocks.append(block_index)
+            self.counts.append(count)
+
+    def extend(self, other: 'SeqBlockIndex'):
+        for position in range(len(other)):
+            self.append(other.first_seqs[position], other.blocks[position], other.counts[position])
+
+    def locate(self, seq: int) -> Optional[Tuple[int, int]]:
+        """(block index, record position) of `seq`, None if no indexed block holds it"""
+        size = len(self)
+        position = bisect.bisect_right(self.first_seqs, seq, 0, size) - 1
+        if position < 0 or seq - self.first_seqs[position] >= self.counts[position]:
+            return None
+        return self.blocks[position], seq - self.first_seqs[position]
+
+class AETHERBlockchain:
+    """Proof-of-work ledger of vehicle records.
+
+    Vehicle records are indexed by vehicle_id as blocks are appended, so
+    history and integrity lookups do not depend on the chain length.
+    Validation is incremental: blocks up to `verified_height` have had their
+    hash and link checked once, so `is_chain_valid` only rehashes blocks
+    appended since. Tampering below the watermark is caught by `audit`, a
+    full rehash from genesis that the auditor thread runs every
+    `audit_interval` seconds.
+    
+    With a `store` the chain lives on disk (block_store.BlockStore) and
+    survives restarts. The verified height is checkpointed every
+    `checkpoint_every` blocks, after audits and on close, so a reopen trusts
+    the checkpointed prefix instead of rehashing it; the vehicle and seq
+    indexes are rebuilt from the segments on a background thread, and
+    lookups report `index_ready` so partial answers are recognisable.
+    """
+
+    def __init__(self, audit_interval: float = 300.0, store: Optional['BlockStore'] = None,
+                 checkpoint_every: int = 1000):
+        self.store = store
+        self.chain = store if store is not None else []
         self.difficulty = 2
-        self.pending_transactions = []
         self.mining_reward = 1
         self.lock = threading.Lock()
+        self.vehicle_index: Dict[str, VehicleRecordIndex] = {}
+        self.seq_index = SeqBlockIndex()
+        # Merkle levels of recently proven blocks, so repeated proofs skip the leaf hashing
+        self.merkle_cache: 'OrderedDict[int, List[List[str]]]' = OrderedDict()
+        self.merkle_cache_size = 64
+        # Proofs are built on worker threads; the levels themselves are computed outside it
+        self.merkle_lock = threading.Lock()
+
+        self.verify_lock = threading.Lock()
+        self.verified_height = 0
+        self.valid = True
+        self.invalid_at: Optional[int] = None
+        self.audit_interval = audit_interval
+        self.audits = 0
+        self.last_audit: Optional[float] = None
+        self.last_audit_ms: Optional[float] = None
+        self.audit_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.checkpoint_every = checkpoint_every
+        self.checkpointed_height = 0
+        self.index_ready = True
+        
+        if not len(self.chain):
+            self.chain.append(self.create_genesis_block())
+        if store is not None:
+            self._resume_from_checkpoint()
+            if len(self.chain) > 1:
+                self.index_ready = False
+                threading.Thread(target=self._rebuild_vehicle_index, args=(len(self.chain),),
+                                 name='aether-ledger-index', daemon=True).start()
     
     def create_genesis_block(self) -> Block:
         return Block(0, {"message": "AETHER Genesis Block"}, "0")
@@ -44,64 +211,353 @@ class AETHERBlockchain:
     def get_latest_block(self) -> Block:
         return self.chain[-1]
     
-    def add_vehicle_data(self, vehicle_id: str, data: Dict[str, Any]) -> bool:
+    def add_vehicle_batch(self, records: List[Dict[str, Any]]) -> Optional[int]:
+        """Seal many vehicle records into one block; returns its index, None on failure.
+        
+        Each record needs `vehicle_id` and `data`; `seq` is kept when present. The
+        block carries the Merkle root of its records so any one of them can be
+        proven without the others.
+        """
         try:
             with self.lock:
+                timestamp = datetime.now().isoformat()
+                entries = [{
+                    "seq": record.get("seq"),
+                    "vehicle_id": record["vehicle_id"],
+                    "timestamp": timestamp,
+                    "data": record["data"],
+                    "hash_verification": hashlib.sha256(
+                        json.dumps(record["data"], sort_keys=True).encode()).hexdigest()
+                } for record in records]
                 block_data = {
-                    "type": "VEHICLE_DATA",
-                    "vehicle_id": vehicle_id,
-                    "timestamp": datetime.now().isoformat(),
-                    "data": data,
-                    "hash_verification": hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+                    "type": "VEHICLE_DATA_BATCH",
+                    "count": len(entries),
+                    "vehicle_ids": sorted({entry["vehicle_id"] for entry in entries}),
+                    "merkle_root": merkle_root([leaf_hash(entry) for entry in entries]),
+                    "records": entries
                 }
-                
-                new_block = Block(
-                    len(self.chain),
-                    block_data,
-                    self.get_latest_block().hash
-                )
-                new_block.mine_block(self.difficulty)
-                self.chain.append(new_block)
-                return True
+                new_block = Block(len(self.chain), block_data, self.get_latest_block().hash)
+                with BLOCK_MINING.time():
+                    new_block.mine_block(self.difficulty)
+                self._append(new_block)
+                return new_block.index
         except Exception as e:
             print(f"Blockchain error: {e}")
+            return None
+    
+    def adopt_block(self, block: Block) -> bool:
+        """Take a block mined by another worker; False if it is already here"""
+        with self.lock:
+            if block.index == len(self.chain):
+                self._append(block)
+                return True
+            if block.index == 0 and self.chain[0].hash != block.hash:
+                self.chain[0] = block
+                with self.verify_lock:
+                    self.verified_height = 0
+                    self.valid = True
+                    self.invalid_at = None
+                return True
             return False
     
+    def _append(self, block: Block):
+        """Append under `lock` and index the block's vehicle records"""
+        self.chain.append(block)
+        self._index_block(self.vehicle_index, self.seq_index, block)
+    
+    @staticmethod
+    def _first_seq(block: Block) -> Optional[int]:
+        records = block.data.get("records") if block.data.get("type") == "VEHICLE_DATA_BATCH" else None
+        first_seq = records[0].get("seq") if records else None
+        return first_seq if isinstance(first_seq, int) else None
+    
+    @classmethod
+    def _index_block(cls, vehicle_index: Dict[str, VehicleRecordIndex], seq_index: SeqBlockIndex, block: Block):
+        if block.data.get("type") == "VEHICLE_DATA_BATCH":
+            for position, record in enumerate(block.data["records"]):
+                vehicle_index.setdefault(record["vehicle_id"], VehicleRecordIndex()).append(
+                    block.index, position, block.timestamp)
+            first_seq = cls._first_seq(block)
+            if first_seq is not None:
+                seq_index.append(first_seq, block.index, len(block.data["records"]))
+        elif "vehicle_id" in block.data:
+            vehicle_index.setdefault(block.data["vehicle_id"], VehicleRecordIndex()).append(
+                block.index, -1, block.timestamp)
+    
+    def _blocks(self, start: int, stop: int) -> Iterator[Block]:
+        """Blocks start..stop-1; a store streams them past its recent-block cache"""
+        if self.store is not None:
+            return self.store.scan(start, stop)
+        return (self.chain[index] for index in range(start, stop))
+    
+    def _rebuild_vehicle_index(self, height: int):
+        """Index the blocks that were on disk at open, then fold in what was appended meanwhile"""
+        started = time.perf_counter()
+        rebuilt: Dict[str, VehicleRecordIndex] = {}
+        rebuilt_seqs = SeqBlockIndex()
+        try:
+            for block in self._blocks(1, height):
+                self._index_block(rebuilt, rebuilt_seqs, block)
+        except Exception as e:
+            print(f"Ledger index rebuild error: {e}")
+            return
+        with self.lock:
+            for vehicle_id, appended in self.vehicle_index.items():
+                rebuilt.setdefault(vehicle_id, VehicleRecordIndex()).extend(appended)
+            rebuilt_seqs.extend(self.seq_index)
+            self.vehicle_index = rebuilt
+            self.seq_index = rebuilt_seqs
+            self.index_ready = True
+        print(f"Ledger vehicle index rebuilt from {height} blocks in {time.perf_counter() - started:.2f}s")
+    
+    def last_sealed_seq(self) -> int:
+        """Highest ingestion seq in the chain (0 if none), read back from the tip so it is
+        known right after open, before the indexes are rebuilt"""
+        for index in range(len(self.chain) - 1, 0, -1):
+            block = self.chain[index]
+            first_seq = self._first_seq(block)
+            if first_seq is not None:
+                return max(self.seq_index.last_seq(), first_seq + len(block.data["records"]) - 1)
+        return self.seq_index.last_seq()
+    
+    def locate_seq(self, seq: int) -> Optional[Tuple[int, int]]:
+        """(block index, position) of the record sealed with ingestion seq `seq`"""
+        return self.seq_index.locate(seq)
+    
+    def _record_at(self, index: VehicleRecordIndex, position: int) -> Tuple[Block, Dict[str, Any]]:
+        block = self.chain[index.blocks[position]]
+        record_position = index.records[position]
+        return block, block.data if record_position < 0 else block.data["records"][record_position]
+    
     def verify_data_integrity(self, vehicle_id: str) -> Dict[str, Any]:
-        vehicle_blocks = [block for block in self.chain if 
-                         block.data.get("vehicle_id") == vehicle_id]
+        index = self.vehicle_index.get(vehicle_id)
+        total_records = len(index) if index else 0
+        chain_valid = self.is_chain_valid()
         
         return {
-            "total_records": len(vehicle_blocks),
-            "chain_valid": self.is_chain_valid(),
-            "last_update": vehicle_blocks[-1].timestamp if vehicle_blocks else None,
-            "integrity_score": 100.0 if self.is_chain_valid() else 0.0
+            "total_records": total_records,
+            "chain_valid": chain_valid,
+            "last_update": self.chain[index.blocks[total_records - 1]].timestamp if total_records else None,
+            "integrity_score": 100.0 if chain_valid else 0.0,
+            "index_ready": self.index_ready
         }
     
+    def _block_valid(self, block: Block, previous: Block) -> bool:
+        if block.hash != block.calculate_hash() or block.previous_hash != previous.hash:
+            return False
+        root = block.data.get("merkle_root")
+        return root is None or root == merkle_root([leaf_hash(record) for record in block.data["records"]])
+    
+    def _first_invalid(self, start: int, stop: int) -> Optional[int]:
+        """First block in start..stop-1 that fails its checks or cannot be read back"""
+        previous = self.chain[start - 1]
+        index = start
+        try:
+            for block in self._blocks(start, stop):
+                if not self._block_valid(block, previous):
+                    return index
+                previous = block
+                index += 1
+        except OSError as e:
+            print(f"Ledger read error: {e}")
+            return index
+        return None
+    
+    def _mark_invalid(self, index: int):
+        self.valid = False
+        self.invalid_at = index
+        self.verified_height = index - 1
+    
     def is_chain_valid(self) -> bool:
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i-1]
-            
-            if current_block.hash != current_block.calculate_hash():
-                return False
-            
-            if current_block.previous_hash != previous_block.hash:
-                return False
+        """Verify the blocks above the watermark; O(1) when nothing was appended"""
+        with self.verify_lock:
+            if self.valid:
+                height = len(self.chain)
+                failed_at = self._first_invalid(self.verified_height + 1, height)
+                if failed_at is not None:
+                    self._mark_invalid(failed_at)
+                    print(f"Blockchain validation failed at block {failed_at}")
+                else:
+                    self.verified_height = max(self.verified_height, height - 1)
+                if self.verified_height - self.checkpointed_height >= self.checkpoint_every:
+                    self._save_checkpoint()
+            return self.valid
+    
+    def audit(self) -> bool:
+        """Rehash the whole chain from genesis and reset the watermark from the result"""
+        started = time.perf_counter()
+        height = len(self.chain)
+        failed_at = self._first_invalid(1, height)
+        elapsed = time.perf_counter() - started
+        CHAIN_AUDIT.observe(elapsed)
+        with self.verify_lock:
+            if failed_at is not None:
+                self._mark_invalid(failed_at)
+                print(f"Blockchain audit failed at block {failed_at}")
+            elif self.invalid_at is None or self.invalid_at < height:
+                self.valid = True
+                self.invalid_at = None
+                self.verified_height = max(self.verified_height, height - 1)
+                self._save_checkpoint()
+            self.audits += 1
+            self.last_audit = time.time()
+            self.last_audit_ms = round(elapsed * 1000, 2)
+        return failed_at is None
+    
+    def _resume_from_checkpoint(self):
+        """Trust the verified height from the last run if the block there is unchanged"""
+        checkpoint = self.store.read_checkpoint()
+        height = checkpoint.get("verified_height", 0)
+        if 0 < height < len(self.chain) and self.chain[height].hash == checkpoint.get("hash"):
+            self.verified_height = self.checkpointed_height = height
+    
+    def _save_checkpoint(self):
+        """Persist the watermark (under `verify_lock`); a no-op without a store"""
+        if self.store is None or not self.valid:
+            return
+        height = self.verified_height
+        try:
+            self.store.write_checkpoint({"verified_height": height, "hash": self.chain[height].hash,
+                                         "saved_at": time.time()})
+            self.checkpointed_height = height
+        except OSError as e:
+            print(f"Ledger checkpoint error: {e}")
+    
+    def start_auditing(self):
+        if self.audit_thread is not None or self.audit_interval <= 0:
+            return
+        self._stop_event.clear()
+        self.audit_thread = threading.Thread(target=self._audit_loop, name='aether-chain-audit')
+        self.audit_thread.daemon = True
+        self.audit_thread.start()
+    
+    def stop_auditing(self):
+        self._stop_event.set()
+        if self.audit_thread:
+            self.audit_thread.join()
+            self.audit_thread = None
+    
+    def close(self):
+        """Stop the auditor, checkpoint the verified height and release the store"""
+        self.stop_auditing()
+        if self.store is not None:
+            self.is_chain_valid()
+            with self.verify_lock:
+                self._save_checkpoint()
+            self.store.close()
+    
+    def _audit_loop(self):
+        while not self._stop_event.wait(self.audit_interval):
+            try:
+                self.audit()
+            except Exception as e:
+                print(f"Blockchain audit error: {e}")
+    
+    def _merkle_levels(self, block: Block) -> List[List[str]]:
+        with self.merkle_lock:
+            levels = self.merkle_cache.get(block.index)
+            if levels is not None and levels[-1][0] == block.data["merkle_root"]:
+                self.merkle_cache.move_to_end(block.index)
+                return levels
+        levels = merkle_levels([leaf_hash(record) for record in block.data["records"]])
+        with self.merkle_lock:
+            self.merkle_cache[block.index] = levels
+            if len(self.merkle_cache) > self.merkle_cache_size:
+                self.merkle_cache.popitem(last=False)
+        return levels
+    
+    def get_inclusion_proof(self, block_index: int, position: int) -> Optional[Dict[str, Any]]:
+        """Record `position` of a Merkle-rooted block with its sibling path to the root
+        and the block header; None if there is no such record. Check it with
+        merkle.verify_record_proof."""
+        if not 0 < block_index < len(self.chain):
+            return None
+        block = self.chain[block_index]
+        records = block.data.get("records")
+        if "merkle_root" not in block.data or not 0 <= position < len(records):
+            return None
+        levels = self._merkle_levels(block)
+        return {
+            "record": records[position],
+            "position": position,
+            "leaf_count": len(records),
+            "leaf_hash": levels[0][position],
+            "proof": inclusion_proof(levels, position),
+            "merkle_root": block.data["merkle_root"],
+            "block": block.header(),
+            "chain_verified": self.is_chain_valid() and block_index <= self.verified_height
+        }
+    
+    def get_verification_status(self) -> Dict[str, Any]:
+        return {
+            "height": len(self.chain),
+            "verified_height": self.verified_height,
+            "valid": self.valid,
+            "invalid_at": self.invalid_at,
+            "audits": self.audits,
+            "last_audit": self.last_audit,
+            "last_audit_ms": self.last_audit_ms,
+            "audit_interval": self.audit_interval,
+            "vehicle_index_ready": self.index_ready,
+            "storage": self.store.get_stats() if self.store is not None else {"backend": "memory"}
+        }
+    
+    @staticmethod
+    def _history_entry(block: Block, record: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "timestamp": block.timestamp,
+            "data": record,
+            "hash": block.hash,
+            "block_index": block.index,
+            "verified": True
+        }
+    
+    def query_vehicle_history(self, vehicle_id: str, since: Optional[float] = None, until: Optional[float] = None,
+                              cursor: Optional[int] = None, limit: int = 100) -> Dict[str, Any]:
+        """Newest-first page of a vehicle's records within [since, until] (epoch seconds).
         
-        return True
-    
-    def get_vehicle_history(self, vehicle_id: str) -> List[Dict[str, Any]]:
-        return [
-            {
-                "timestamp": block.timestamp,
-                "data": block.data,
-                "hash": block.hash,
-                "verified": True
-            }
-            for block in self.chain 
-            if block.data.get("vehicle_id") == vehicle_id
-        ]
-
-# Global blockchain instance
-aether_blockchain = AETHERBlockchain()
\ No newline at end of file
+        Cursors are positions in the vehicle's index; pass `next_cursor` back to continue.
+        While `index_ready` is False (rebuilding after a restart) only records
+        appended since the restart are found.
+        """
+        limit = max(1, min(limit, 1000))
+        index = self.vehicle_index.get(vehicle_id)
+        size = len(index) if index else 0
+        lo, hi = 0, size
+        if size and since is not None:
+            lo = bisect.bisect_left(index.times, since, 0, size)
+        if size and until is not None:
+            hi = bisect.bisect_right(index.times, until, 0, size)
+        if cursor is not None:
+            hi = min(hi, max(0, int(cursor)))
+        
+        start = max(lo, hi - limit)
+        records = [self._history_entry(*self._record_at(index, position)) for position in range(hi - 1, start - 1, -1)]
+        return {
+            "records": records,
+            "next_cursor": start if start > lo else None,
+            "count": len(records),
+            "total_records": size,
+            "index_ready": self.index_ready
+        }
+
+def create_blockchain() -> AETHERBlockchain:
+    """Ledger configured from AETHER_CHAIN_AUDIT_INTERVAL (seconds between full audits, 0 = never)
+    and AETHER_LEDGER_DIR (on-disk segments, empty = in memory).
+
+    With a shared state backend the chain stays in memory: every worker
+    replays it from the shared blocks stream, and several processes must not
+    append to one segment directory.
+    """
+    directory = os.environ.get('AETHER_LEDGER_DIR', 'aether_ledger')
+    store = None
+    if directory and os.environ.get('AETHER_STATE_BACKEND', 'local').lower() == 'local':
+        from block_store import BlockStore
+        store = BlockStore(
+            directory,
+            blocks_per_segment=int(os.environ.get('AETHER_LEDGER_SEGMENT_BLOCKS', '10000')),
+            cache_size=int(os.environ.get('AETHER_LEDGER_CACHE_BLOCKS', '1024')),
+            fsync=os.environ.get('AETHER_LEDGER_FSYNC', '').lower() in ('1', 'true', 'yes')
+        )
+    return AETHERBlockchain(audit_interval=float(os.environ.get('AETHER_CHAIN_AUDIT_INTERVAL', '300')),
+                            store=store)
@@ -0,0 +1,139 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+APP_ROOT = str(Path(__file__).resolve().parent)
+
+class BlockingCallDetector:
+    """Debug aid that finds the code blocking the event loop.
+
+    A heartbeat task on the loop stamps the time every few milliseconds; a
+    watchdog thread checks the stamp. When the loop misses its heartbeat by
+    more than `threshold` seconds the watchdog grabs the loop thread's
+    current stack (sys._current_frames), and once the loop runs again the
+    stall is charged to the innermost frame in the AETHER backend. Offenders
+    are aggregated by that location and logged as they happen.
+    """
+
+    def __init__(self, enabled: bool = False, threshold: float = 0.1, max_depth: int = 30,
+                 max_offenders: int = 200):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.interval = max(0.005, threshold / 4)
+        self.max_depth = max_depth
+        self.max_offenders = max_offenders
+        self.offenders: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self.stalls = 0
+        self.blocked_seconds = 0.0
+        self.beat = 0.0
+        self.loop_thread_id: Optional[int] = None
+        self.task: Optional[asyncio.Task] = None
+        self.watch_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def start(self):
+        if self.task is not None:
+            return
+        self.loop_thread_id = threading.get_ident()
+        self.beat = time.monotonic()
+        self.task = asyncio.create_task(self._heartbeat())
+        self._stop_event.clear()
+        self.watch_thread = threading.Thread(target=self._watch, name='aether-blocking-watchdog')
+        self.watch_thread.daemon = True
+        self.watch_thread.start()
+        print(f"Blocking-call detector on: reporting event loop stalls over {self.threshold * 1000:.0f}ms")
+
+    async def stop(self):
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+        self._stop_event.set()
+        await asyncio.to_thread(self.watch_thread.join)
+        self.watch_thread = None
+
+    async def _heartbeat(self):
+        while True:
+            self.beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self):
+        stalled_beat: Optional[float] = None
+        stack: List[traceback.FrameSummary] = []
+        while not self._stop_event.wait(self.interval):
+            beat = self.beat
+            if stalled_beat is not None and beat != stalled_beat:
+                # The loop is running again: charge the whole stall to the captured stack
+                self._record(stack, beat - stalled_beat - self.interval)
+                stalled_beat = None
+            if stalled_beat is None and time.monotonic() - beat > self.threshold + self.interval:
+                frame = sys._current_frames().get(self.loop_thread_id)
+                if frame is not None:
+                    stalled_beat = beat
+                    stack = traceback.extract_stack(frame)[-self.max_depth:]
+                del frame
+
+    @staticmethod
+    def _describe(frame: traceback.FrameSummary) -> str:
+        return f"{os.path.basename(frame.filename)}:{frame.lineno} in {frame.name}"
+
+    def _record(self, stack: List[traceback.FrameSummary], blocked: float):
+        app_frames = [frame for frame in stack if frame.filename.startswith(APP_ROOT)
+                      and frame.filename != __file__]
+        culprit = app_frames[-1] if app_frames else stack[-1]
+        location = self._describe(culprit)
+        blocked_ms = round(blocked * 1000, 1)
+        detail = f" -> {self._describe(stack[-1])}" if stack[-1] is not culprit else ''
+        print(f"Event loop blocked for {blocked_ms}ms at {location}{detail}")
+
+        with self.lock:
+            self.stalls += 1
+            self.blocked_seconds += blocked
+            offender = self.offenders.get(location)
+            if offender is None:
+                if len(self.offenders) >= self.max_offenders:
+                    # Forget the least harmful location to stay bounded
+                    del self.offenders[min(self.offenders, key=lambda key: self.offenders[key]['total_ms'])]
+                offender = self.offenders[location] = {'location': location, 'count': 0, 'total_ms': 0.0,
+                                                       'max_ms': 0.0}
+            offender['count'] += 1
+            offender['total_ms'] = round(offender['total_ms'] + blocked_ms, 1)
+            offender['max_ms'] = max(offender['max_ms'], blocked_ms)
+            offender['last_seen'] = datetime.now().isoformat()
+            offender['stack'] = [f"{self._describe(frame)}: {frame.line}" for frame in stack]
+
+    def get_report(self, limit: int = 20) -> Dict[str, Any]:
+        """Worst offenders by total blocked time"""
+        with self.lock:
+            offenders = sorted(self.offenders.values(), key=lambda offender: offender['total_ms'], reverse=True)
+            return {
+                'enabled': self.enabled,
+                'running': self.task is not None,
+                'threshold_ms': round(self.threshold * 1000, 1),
+                'stalls': self.stalls,
+                'blocked_ms': round(self.blocked_seconds * 1000, 1),
+                'offenders': [dict(offender) for offender in offenders[:limit]]
+            }
+
+    def reset(self):
+        with self.lock:
+            self.offenders.clear()
+            self.stalls = 0
+            self.blocked_seconds = 0.0
+
+# Global blocking-call detector instance (opt-in: AETHER_DEBUG_BLOCKING=1)
+blocking_detector = BlockingCallDetector(
+    enabled=os.environ.get('AETHER_DEBUG_BLOCKING', '').lower() in ('1', 'true', 'yes'),
+    threshold=float(os.environ.get('AETHER_DEBUG_BLOCKING_MS', '100')) / 1000
+)
@@ -0,0 +1,164 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Any, Optional, Tuple, Union
+
+from fastapi import WebSocket
+
+from compression import FrameCompressor
+from field_projection import FieldTree, format_fields
+from instrumentation import ALERT_DELIVERY, WS_FRAME_SEND
+
+Payload = Union[str, bytes]
+
+class ClientSession:
+    """Per-connection protocol state and outbound queue.
+
+    Each session owns a sender task, so a slow client never delays the
+    others. Alert frames go out first through their own priority lane.
+    Control messages go through a bounded FIFO (the oldest entry is dropped
+    on overflow); snapshot and topic frames are coalesced so a slow consumer
+    always receives the newest state rather than a backlog. With a
+    `compressor` every frame leaves as a binary DEFLATE frame that shares
+    one compression context for the life of the connection.
+    """
+
+    def __init__(self, websocket: WebSocket, protocol: str = 'full', encoding: str = 'json',
+                 max_queue: int = 32, send_timeout: float = 5.0,
+                 compressor: Optional[FrameCompressor] = None, fields: Optional[FieldTree] = None):
+        self.websocket = websocket
+        self.protocol = protocol
+        self.encoding = encoding
+        self.compressor = compressor
+        # Snapshot projection; sessions with the same `fields_key` share frames
+        self.fields = fields
+        self.fields_key = format_fields(fields)
+        self.acked_seq: Optional[int] = None
+        # Seq of the last keyframe sent; its ack is taken even after a producer restart resets seqs
+        self.keyframe_seq: Optional[int] = None
+        self.frames_since_keyframe = 0
+        self.keyframe_requested = True
+        # topic -> desired interval in seconds; empty means the full snapshot stream
+        self.topics: Dict[str, float] = {}
+        self.topic_due: Dict[str, float] = {}
+
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.priority: deque = deque()
+        self.queue: deque = deque()
+        self.pending_snapshot: Optional[Payload] = None
+        self.pending_keyframe = False
+        self.pending_topics: 'OrderedDict[str, Payload]' = OrderedDict()
+        self.wakeup = asyncio.Event()
+        self.sender_task: Optional[asyncio.Task] = None
+        self.over_budget_since: Optional[float] = None
+        self.connected_at = time.time()
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    async def send(self, payload: Payload):
+        if self.compressor is not None:
+            payload = self.compressor.compress(payload)
+        if isinstance(payload, str):
+            await self.websocket.send_text(payload)
+        else:
+            await self.websocket.send_bytes(payload)
+
+    def queue_depth(self) -> int:
+        return (len(self.priority) + len(self.queue) + (self.pending_snapshot is not None)
+                + len(self.pending_topics))
+
+    def _mark_over_budget(self):
+        if self.over_budget_since is None:
+            self.over_budget_since = time.monotonic()
+
+    def enqueue(self, payload: Payload):
+        """Queue a control message, dropping the oldest one when the queue is full"""
+        if len(self.queue) >= self.max_queue:
+            self.queue.popleft()
+            self.dropped += 1
+            self._mark_over_budget()
+        self.queue.append(payload)
+        self.wakeup.set()
+
+    def enqueue_priority(self, payload: Payload, triggered_at: Optional[float] = None) -> bool:
+        """Queue an alert frame ahead of every other frame; `triggered_at` (epoch
+        seconds) feeds the delivery latency histogram once the frame is sent.
+        Alerts are never dropped: False means the lane is full and the caller
+        should evict the session."""
+        if len(self.priority) >= self.max_queue:
+            self._mark_over_budget()
+            return False
+        self.priority.append((payload, triggered_at))
+        self.wakeup.set()
+        return True
+
+    def offer_snapshot(self, payload: Payload):
+        """Replace any unsent snapshot frame with the newest one"""
+        if self.pending_snapshot is not None:
+            self.coalesced += 1
+            self._mark_over_budget()
+        self.pending_snapshot = payload
+        self.wakeup.set()
+
+    def offer_topic(self, topic: str, payload: Payload):
+        """Replace any unsent frame for this topic with the newest one"""
+        if topic in self.pending_topics:
+            self.coalesced += 1
+            self._mark_over_budget()
+        self.pending_topics[topic] = payload
+        self.wakeup.set()
+
+    def over_budget_for(self) -> float:
+        if self.over_budget_since is None:
+            return 0.0
+        return time.monotonic() - self.over_budget_since
+
+    def _next_payload(self) -> Tuple[Optional[Payload], Optional[float]]:
+        """Next frame to send and, for alerts, when the alert was triggered"""
+        if self.priority:
+            return self.priority.popleft()
+        if self.queue:
+            return self.queue.popleft(), None
+        if self.pending_snapshot is not None:
+            payload, self.pending_snapshot = self.pending_snapshot, None
+            self.pending_keyframe = False
+            return payload, None
+        if self.pending_topics:
+            return self.pending_topics.popitem(last=False)[1], None
+        return None, None
+
+    async def run_sender(self):
+        """Drain the outbound queue; raises if a send fails or exceeds send_timeout"""
+        while True:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            while True:
+                payload, triggered_at = self._next_payload()
+                if payload is None:
+                    break
+                started = time.perf_counter()
+                await asyncio.wait_for(self.send(payload), self.send_timeout)
+                WS_FRAME_SEND.observe(time.perf_counter() - started)
+                if triggered_at is not None:
+                    ALERT_DELIVERY.observe(time.time() - triggered_at, stage='sent')
+                self.sent += 1
+            self.over_budget_since = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        client = self.websocket.client
+        return {
+            'client': f"{client.host}:{client.port}" if client else 'unknown',
+            'protocol': self.protocol,
+            'encoding': self.encoding,
+            'deflate': self.compressor is not None,
+            'fields': self.fields_key,
+            'topics': dict(self.topics),
+            'queue_depth': self.queue_depth(),
+            'sent': self.sent,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced,
+            'over_budget_seconds': round(self.over_budget_for(), 2),
+            'connected_seconds': round(time.time() - self.connected_at, 1)
+        }
@@ -0,0 +1,204 @@
+import asyncio
+import os
+import socket
+import threading
+import time
+from typing import Dict, Any, Awaitable, Callable, List, Optional
+
+from blockchain_security import Block
+from state_backend import StateBackend, state_backend
+
+Listener = Callable[[str, Any], Awaitable[None]]
+
+class ClusterCoordinator:
+    """Keeps several uvicorn workers consistent through the state backend.
+
+    One worker holds the leader lease and runs the simulations (IoT
+    sensors, swarm coordination), publishing their readings every
+    `publish_interval`; the other workers serve the published copies.
+    Blockchain blocks and emergency alerts are append-only streams that
+    every worker writes to and tails. With an unshared backend this worker
+    is always the leader and reads go straight to the local objects.
+    """
+
+    LEADER_LEASE = 'leader'
+
+    def __init__(self, backend: StateBackend, lease_ttl: float = 5.0, publish_interval: float = 0.5):
+        self.backend = backend
+        self.lease_ttl = lease_ttl
+        self.publish_interval = publish_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.is_leader = not backend.shared
+        self.publishers: Dict[str, Callable[[], Any]] = {}
+        self.listeners: List[Listener] = []
+        self.task: Optional[asyncio.Task] = None
+        self.alerts_lock = asyncio.Lock()
+        self.ledger_lock = threading.Lock()
+        self.blocks_seq = 0
+        self.alerts_seq = 0
+        self.leader_since: Optional[float] = None if backend.shared else time.time()
+        self.leader_changes = 0
+
+    def publish(self, key: str, func: Callable[[], Any]):
+        """Register state the leader computes and followers read"""
+        self.publishers[key] = func
+
+    def add_listener(self, listener: Listener):
+        """Called with ('alert', entry) for every alert in stream order and ('blocks', count)
+        for blocks adopted from other workers. An alert entry carries `seq`, `alert`,
+        `local` (raised by this worker) and `replayed` (history loaded at startup)."""
+        self.listeners.append(listener)
+
+    def read(self, key: str) -> Any:
+        func = self.publishers[key]
+        if self.is_leader:
+            return func()
+        value = self.backend.get(key)
+        # Nothing published yet (leader still starting): fall back to the local object
+        return value if value is not None else func()
+
+    # --- Leadership -----------------------------------------------------------
+
+    async def start(self, on_elected: Callable[[], Awaitable[None]], on_demoted: Callable[[], Awaitable[None]],
+                    blockchain, alert_history: int = 0):
+        """Run the leader election loop; simulations start and stop with leadership.
+
+        The newest `alert_history` alerts already in the stream are replayed
+        to the listeners so a freshly started worker can answer queries.
+        """
+        if not self.backend.shared:
+            await on_elected()
+            return
+        await asyncio.to_thread(self._publish_genesis, blockchain)
+        last_seq = await asyncio.to_thread(self.backend.last_seq, 'emergency_alerts')
+        self.alerts_seq = max(0, last_seq - alert_history)
+        await self._drain_alerts(replay_until=last_seq)
+        self.task = asyncio.create_task(self._run(on_elected, on_demoted, blockchain))
+
+    async def stop(self, on_demoted: Callable[[], Awaitable[None]]):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        if self.is_leader and self.backend.shared:
+            await asyncio.to_thread(self.backend.release_lease, self.LEADER_LEASE, self.worker_id)
+        await on_demoted()
+
+    async def _run(self, on_elected, on_demoted, blockchain):
+        while True:
+            try:
+                leader = await asyncio.to_thread(self.backend.acquire_lease, self.LEADER_LEASE,
+                                                 self.worker_id, self.lease_ttl)
+                if leader != self.is_leader:
+                    self.is_leader = leader
+                    self.leader_changes += 1
+                    self.leader_since = time.time() if leader else None
+                    print(f"Worker {self.worker_id} is now {'leader' if leader else 'follower'}")
+                    await (on_elected() if leader else on_demoted())
+                if leader:
+                    for key, func in self.publishers.items():
+                        value = await asyncio.to_thread(func)
+                        await asyncio.to_thread(self.backend.set, key, value)
+                await self._tail_streams(blockchain)
+            except Exception as e:
+                print(f"Cluster coordination error: {e}")
+            await asyncio.sleep(self.publish_interval)
+
+    async def _tail_streams(self, blockchain):
+        adopted = await asyncio.to_thread(self.sync_blocks, blockchain)
+        if adopted:
+            await self._notify('blocks', adopted)
+        await self._drain_alerts()
+
+    async def _drain_alerts(self, replay_until: int = 0):
+        """Deliver every alert past alerts_seq to the listeners, in stream order"""
+        async with self.alerts_lock:
+            while True:
+                entries = await asyncio.to_thread(self.backend.read_stream, 'emergency_alerts', self.alerts_seq)
+                if not entries:
+                    return
+                for seq, entry in entries:
+                    self.alerts_seq = seq
+                    await self._notify('alert', {'seq': seq, 'alert': entry['alert'],
+                                                 'local': entry.get('worker') == self.worker_id,
+                                                 'replayed': seq <= replay_until})
+
+    async def _notify(self, kind: str, payload: Any):
+        for listener in self.listeners:
+            try:
+                await listener(kind, payload)
+            except Exception as e:
+                print(f"Cluster listener error: {e}")
+
+    # --- Shared ledger ---------------------------------------------------------
+
+    def _publish_genesis(self, blockchain):
+        with self.backend.lock('blockchain'):
+            self.sync_blocks(blockchain)
+            if self.blocks_seq == 0:
+                self.blocks_seq = self.backend.append('blocks', blockchain.chain[0].to_dict())
+
+    def sync_blocks(self, blockchain) -> int:
+        """Adopt blocks other workers appended to the shared ledger; returns how many"""
+        if not self.backend.shared:
+            return 0
+        adopted = 0
+        with self.ledger_lock:
+            while True:
+                entries = self.backend.read_stream('blocks', self.blocks_seq)
+                if not entries:
+                    return adopted
+                for seq, fields in entries:
+                    adopted += blockchain.adopt_block(Block.from_dict(fields))
+                    self.blocks_seq = seq
+
+    def commit(self, blockchain, mine: Callable[[], Any]) -> Any:
+        """Run `mine` (which appends one block) on top of the shared chain tip so every
+        worker agrees on the ledger; returns whatever `mine` returns"""
+        if not self.backend.shared:
+            return mine()
+        with self.backend.lock('blockchain'):
+            self.sync_blocks(blockchain)
+            tip = len(blockchain.chain)
+            result = mine()
+            if len(blockchain.chain) > tip:
+                with self.ledger_lock:
+                    self.blocks_seq = self.backend.append('blocks', blockchain.get_latest_block().to_dict())
+        return result
+
+    async def record_alert(self, alert: Dict[str, Any]) -> int:
+        """Append an alert to the shared stream and deliver it locally; returns its seq"""
+        if not self.backend.shared:
+            # Single worker: nothing to share, so keep no second copy of the history
+            async with self.alerts_lock:
+                self.alerts_seq += 1
+                seq = self.alerts_seq
+                await self._notify('alert', {'seq': seq, 'alert': alert, 'local': True, 'replayed': False})
+            return seq
+        seq = await asyncio.to_thread(self.backend.append, 'emergency_alerts',
+                                      {'worker': self.worker_id, 'alert': alert})
+        await self._drain_alerts()
+        return seq
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'worker_id': self.worker_id,
+            'backend': type(self.backend).__name__,
+            'shared': self.backend.shared,
+            'is_leader': self.is_leader,
+            'leader_since': self.leader_since,
+            'leader_changes': self.leader_changes,
+            'published_keys': list(self.publishers),
+            'blocks_seq': self.blocks_seq,
+            'alerts_seq': self.alerts_seq
+        }
+
+# Global cluster coordinator instance
+cluster = ClusterCoordinator(
+    state_backend,
+    lease_ttl=float(os.environ.get('AETHER_LEADER_LEASE_TTL', '5.0')),
+    publish_interval=float(os.environ.get('AETHER_PUBLISH_INTERVAL', '0.5'))
+)
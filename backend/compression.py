@@ -0,0 +1,261 @@
+import gzip
+import os
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from instrumentation import metrics_registry
+from serialization import negotiate_subprotocol
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSION_INPUT = metrics_registry.counter(
+    'aether_compression_input_bytes_total', 'Bytes handed to the compressor', ('channel', 'encoding'))
+COMPRESSION_OUTPUT = metrics_registry.counter(
+    'aether_compression_output_bytes_total', 'Bytes produced by the compressor', ('channel', 'encoding'))
+COMPRESSION_CPU = metrics_registry.histogram(
+    'aether_compression_cpu_seconds', 'CPU time spent compressing one body or frame', ('channel', 'encoding'),
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05))
+
+# Media types that are already compressed; recompressing only burns CPU
+INCOMPRESSIBLE_PREFIXES = ('image/', 'video/', 'audio/', 'application/zip', 'application/gzip')
+
+DEFLATE_SUFFIX = '+deflate'
+
+def _record(channel: str, encoding: str, size_in: int, size_out: int, cpu: float):
+    COMPRESSION_INPUT.inc(size_in, channel=channel, encoding=encoding)
+    COMPRESSION_OUTPUT.inc(size_out, channel=channel, encoding=encoding)
+    COMPRESSION_CPU.observe(cpu, channel=channel, encoding=encoding)
+
+def compression_ratios() -> Dict[Tuple[str, str], float]:
+    """Output/input bytes per (channel, encoding) since start"""
+    with COMPRESSION_INPUT.lock:
+        inputs = dict(COMPRESSION_INPUT.values)
+    with COMPRESSION_OUTPUT.lock:
+        outputs = dict(COMPRESSION_OUTPUT.values)
+    return {key: round(outputs.get(key, 0) / size, 4) for key, size in inputs.items() if size}
+
+metrics_registry.callback('aether_compression_ratio', 'Compressed/uncompressed bytes since start',
+                          compression_ratios, ('channel', 'encoding'))
+
+def available_content_encodings() -> List[str]:
+    return (['br'] if brotli is not None else []) + ['gzip']
+
+def choose_content_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best coding the client accepts: brotli when installed, then gzip"""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(','):
+        coding, *params = [item.strip() for item in part.split(';')]
+        quality = 1.0
+        for param in params:
+            if param.startswith('q='):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.lower()] = quality
+    for coding in available_content_encodings():
+        if accepted.get(coding, accepted.get('*', 0.0)) > 0:
+            return coding
+    return None
+
+class CompressionMiddleware:
+    """ASGI middleware compressing HTTP bodies of at least `minimum_size` bytes.
+
+    Uses brotli when the optional package is installed and the client
+    accepts it, gzip otherwise. Bodies up to `max_buffer` bytes are
+    collected and compressed in one go; larger ones are compressed as they
+    stream. ETags get a coding suffix (and incoming If-None-Match headers
+    lose it), and compressed bodies of ETagged responses are memoised so
+    cache hits are not recompressed.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4,
+                 memo_size: int = 256, max_buffer: int = 1 << 20):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.memo_size = memo_size
+        self.max_buffer = max_buffer
+        self.memo: 'OrderedDict[Tuple[str, str], bytes]' = OrderedDict()
+
+    def compress(self, body: bytes, coding: str) -> bytes:
+        started = time.thread_time()
+        if coding == 'br':
+            compressed = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            compressed = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        _record('http', coding, len(body), len(compressed), time.thread_time() - started)
+        return compressed
+
+    def _compressed_body(self, body: bytes, coding: str, etag: Optional[str]) -> bytes:
+        if etag is None:
+            return self.compress(body, coding)
+        key = (etag, coding)
+        compressed = self.memo.get(key)
+        if compressed is None:
+            compressed = self.memo[key] = self.compress(body, coding)
+            if len(self.memo) > self.memo_size:
+                self.memo.popitem(last=False)
+        else:
+            self.memo.move_to_end(key)
+        return compressed
+
+    @staticmethod
+    def _strip_etag_suffixes(scope):
+        headers = []
+        for name, value in scope['headers']:
+            if name == b'if-none-match':
+                for coding in available_content_encodings():
+                    value = value.replace(f'-{coding}"'.encode(), b'"')
+            headers.append((name, value))
+        scope['headers'] = headers
+
+    def _skip(self, start_message: Dict[str, Any]) -> bool:
+        headers = Headers(raw=start_message['headers'])
+        return ('content-encoding' in headers or start_message['status'] in (204, 304)
+                or headers.get('content-type', '').startswith(INCOMPRESSIBLE_PREFIXES))
+
+    @staticmethod
+    def _tag_representation(headers: MutableHeaders, coding: str):
+        etag = headers.get('etag')
+        if etag and etag.endswith('"'):
+            headers['etag'] = f'{etag[:-1]}-{coding}"'
+        headers.add_vary_header('Accept-Encoding')
+
+    def _compressed_headers(self, start_message: Dict[str, Any], coding: str, length: Optional[int]):
+        headers = MutableHeaders(scope=start_message)
+        headers['content-encoding'] = coding
+        if length is None:
+            del headers['content-length']
+        else:
+            headers['content-length'] = str(length)
+        self._tag_representation(headers, coding)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        coding = choose_content_encoding(Headers(scope=scope).get('accept-encoding'))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        self._strip_etag_suffixes(scope)
+
+        start_message: Optional[Dict[str, Any]] = None
+        parts: List[bytes] = []
+        buffered = 0
+        stream: Optional[StreamCompressor] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, buffered, stream, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message['type'] == 'http.response.start':
+                start_message = message
+                if message['status'] == 304:
+                    # Validated against the compressed representation the client holds
+                    self._tag_representation(MutableHeaders(scope=message), coding)
+                if self._skip(message):
+                    passthrough = True
+                    await send(message)
+                return
+            if message['type'] != 'http.response.body':
+                await send(message)
+                return
+            body, more_body = message.get('body', b''), message.get('more_body', False)
+            if stream is not None:
+                await send({'type': 'http.response.body', 'body': stream.process(body, more_body),
+                            'more_body': more_body})
+                return
+            parts.append(body)
+            buffered += len(body)
+            if more_body and buffered <= self.max_buffer:
+                # Middleware above us streams even small bodies; keep collecting
+                return
+            body = b''.join(parts)
+            if more_body:
+                # Too large to hold: compress chunk by chunk without a Content-Length
+                stream = StreamCompressor(coding, self.gzip_level, self.brotli_quality)
+                self._compressed_headers(start_message, coding, None)
+                await send(start_message)
+                await send({'type': 'http.response.body', 'body': stream.process(body, True), 'more_body': True})
+                return
+            if len(body) < self.minimum_size:
+                await send(start_message)
+                await send({'type': 'http.response.body', 'body': body})
+                return
+            body = self._compressed_body(body, coding, Headers(raw=start_message['headers']).get('etag'))
+            self._compressed_headers(start_message, coding, len(body))
+            await send(start_message)
+            await send({'type': 'http.response.body', 'body': body})
+
+        await self.app(scope, receive, send_wrapper)
+
+class StreamCompressor:
+    """Incremental gzip or brotli encoder for bodies too large to buffer"""
+
+    def __init__(self, coding: str, gzip_level: int, brotli_quality: int):
+        self.coding = coding
+        if coding == 'br':
+            self.compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            self.compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def process(self, chunk: bytes, more_body: bool) -> bytes:
+        started = time.thread_time()
+        if self.coding == 'br':
+            out = self.compressor.process(chunk) + (self.compressor.flush() if more_body else self.compressor.finish())
+        else:
+            out = self.compressor.compress(chunk) + self.compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+        _record('http', self.coding, len(chunk), len(out), time.thread_time() - started)
+        return out
+
+class FrameCompressor:
+    """Per-connection raw DEFLATE stream for WebSocket frames.
+
+    Works like permessage-deflate with context takeover: one compressor
+    lives for the whole connection, so later frames are encoded against
+    the history of earlier ones, and each frame ends with a sync flush
+    whose 00 00 ff ff trailer is stripped. Decode with
+    zlib.decompressobj(-15).decompress(frame + b'\\x00\\x00\\xff\\xff').
+    """
+
+    def __init__(self, level: int = 6):
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+
+    def compress(self, payload: Union[str, bytes]) -> bytes:
+        data = payload.encode() if isinstance(payload, str) else payload
+        started = time.thread_time()
+        compressed = (self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH))[:-4]
+        _record('ws', 'deflate', len(data), len(compressed), time.thread_time() - started)
+        return compressed
+
+def negotiate_ws_compression(requested: List[str]) -> Tuple[Optional[str], bool]:
+    """(encoding, deflate) for the first offered subprotocol we can serve;
+    a '+deflate' suffix (e.g. 'aether.json+deflate') asks for compressed frames"""
+    for subprotocol in requested:
+        deflate = subprotocol.endswith(DEFLATE_SUFFIX)
+        encoding = negotiate_subprotocol([subprotocol[:-len(DEFLATE_SUFFIX)] if deflate else subprotocol])
+        if encoding:
+            return encoding, deflate
+    return None, False
+
+# Settings shared by the HTTP middleware and the WebSocket frame compressors
+COMPRESSION_SETTINGS = {
+    'minimum_size': int(os.environ.get('AETHER_COMPRESSION_MIN_SIZE', '1024')),
+    'gzip_level': int(os.environ.get('AETHER_GZIP_LEVEL', '6')),
+    'brotli_quality': int(os.environ.get('AETHER_BROTLI_QUALITY', '4'))
+}
+WS_DEFLATE_LEVEL = int(os.environ.get('AETHER_WS_DEFLATE_LEVEL', '6'))
@@ -0,0 +1,137 @@
+import copy
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from serialization import encode_frame
+
+def _escape(token: str) -> str:
+    return str(token).replace('~', '~0').replace('/', '~1')
+
+def _unescape(token: str) -> str:
+    return token.replace('~1', '/').replace('~0', '~')
+
+def diff(old: Any, new: Any, path: str = '') -> List[Dict[str, Any]]:
+    """JSON-Patch style operations that turn `old` into `new`.
+
+    Dicts are diffed key by key and equal-length lists element by element;
+    anything else that changed is replaced wholesale.
+    """
+    if old == new:
+        return []
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({'op': 'remove', 'path': f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child_path = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({'op': 'add', 'path': child_path, 'value': value})
+            else:
+                ops.extend(diff(old[key], value, child_path))
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for index, (old_item, new_item) in enumerate(zip(old, new)):
+            ops.extend(diff(old_item, new_item, f"{path}/{index}"))
+        return ops
+
+    return [{'op': 'replace', 'path': path, 'value': new}]
+
+def apply_patch(document: Any, ops: List[Dict[str, Any]]) -> Any:
+    """Apply operations produced by `diff` to a copy of `document`"""
+    document = copy.deepcopy(document)
+    for op in ops:
+        if op['path'] == '':
+            document = copy.deepcopy(op['value'])
+            continue
+
+        tokens = [_unescape(token) for token in op['path'].split('/')[1:]]
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = int(tokens[-1]) if isinstance(parent, list) else tokens[-1]
+
+        if op['op'] == 'remove':
+            del parent[last]
+        else:
+            parent[last] = copy.deepcopy(op['value'])
+    return document
+
+class DeltaStream:
+    """Server side of the delta protocol.
+
+    Keeps the last few published snapshots by sequence number and caches
+    encoded delta frames per (base_seq, seq, encoding), so clients that
+    acknowledged the same frame share one diff and one serialization.
+    """
+
+    def __init__(self, history_size: int = 16):
+        self.history_size = history_size
+        self.frames: 'OrderedDict[int, Dict[str, Any]]' = OrderedDict()
+        self.seq = 0
+        self._encoded: Dict[Tuple[Optional[int], int, str], Any] = {}
+
+    def publish(self, snapshot: Dict[str, Any]) -> int:
+        self.seq += 1
+        self.frames[self.seq] = snapshot
+        while len(self.frames) > self.history_size:
+            self.frames.popitem(last=False)
+        # Encoded frames are only ever requested for the newest seq
+        self._encoded = {}
+        return self.seq
+
+    def has_frame(self, seq: Optional[int]) -> bool:
+        return seq in self.frames
+
+    def encode_keyframe(self, encoding: str = 'json') -> Union[str, bytes]:
+        key = (None, self.seq, encoding)
+        if key not in self._encoded:
+            self._encoded[key] = encode_frame({
+                'type': 'keyframe',
+                'seq': self.seq,
+                'data': self.frames[self.seq]
+            }, encoding)
+        return self._encoded[key]
+
+    def encode_delta(self, base_seq: int, encoding: str = 'json') -> Union[str, bytes]:
+        ops_key = (base_seq, self.seq, 'ops')
+        if ops_key not in self._encoded:
+            self._encoded[ops_key] = diff(self.frames[base_seq], self.frames[self.seq])
+        key = (base_seq, self.seq, encoding)
+        if key not in self._encoded:
+            self._encoded[key] = encode_frame({
+                'type': 'delta',
+                'seq': self.seq,
+                'base_seq': base_seq,
+                'ops': self._encoded[ops_key]
+            }, encoding)
+        return self._encoded[key]
+
+class DeltaDecoder:
+    """Client side of the delta protocol: rebuilds snapshots from keyframes and deltas.
+
+    Returns the ack message the client should send back after each frame.
+    """
+
+    def __init__(self, history_size: int = 16):
+        self.history_size = history_size
+        self.states: 'OrderedDict[int, Any]' = OrderedDict()
+        self.snapshot: Any = None
+
+    def apply(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        if message['type'] == 'keyframe':
+            self.snapshot = message['data']
+        elif message['type'] == 'delta':
+            if message['base_seq'] not in self.states:
+                return {'type': 'keyframe_request'}
+            self.snapshot = apply_patch(self.states[message['base_seq']], message['ops'])
+        else:
+            raise ValueError(f"Unknown frame type: {message['type']}")
+
+        self.states[message['seq']] = self.snapshot
+        while len(self.states) > self.history_size:
+            self.states.popitem(last=False)
+        return {'type': 'ack', 'seq': message['seq']}
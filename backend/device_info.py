@@ -275,6 +275,3 @@ class DeviceInfoManager:
                 return 'Unknown'
         except Exception:
             return 'Unknown'
-
-# Global device info manager
-device_manager = DeviceInfoManager()
\ No newline at end of file
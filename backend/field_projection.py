@@ -0,0 +1,89 @@
+from typing import Dict, Any, Iterable, List, Optional
+
+# Nested path tree: {'aether_data': {'vehicle_health': {}}}; an empty dict selects the whole subtree
+FieldTree = Dict[str, 'FieldTree']
+
+def parse_fields(spec: Optional[str]) -> Optional[FieldTree]:
+    """Parse 'a.b,c' into a path tree; None or an empty spec selects everything"""
+    if not spec:
+        return None
+    tree: FieldTree = {}
+    for path in spec.split(','):
+        parts = [part.strip() for part in path.strip().split('.')]
+        if not all(parts):
+            continue
+        node = tree
+        for position, part in enumerate(parts):
+            if part in node and not node[part]:
+                # An ancestor was already selected whole
+                break
+            if position == len(parts) - 1:
+                node[part] = {}
+            else:
+                node = node.setdefault(part, {})
+    return tree or None
+
+def format_fields(tree: Optional[FieldTree]) -> Optional[str]:
+    """Canonical spec for a tree, usable as a cache or grouping key"""
+    if tree is None:
+        return None
+    return ','.join(sorted(_paths(tree)))
+
+def _paths(tree: FieldTree, prefix: str = '') -> Iterable[str]:
+    for name, subtree in tree.items():
+        path = f"{prefix}{name}"
+        if subtree:
+            yield from _paths(subtree, path + '.')
+        else:
+            yield path
+
+def merge_fields(trees: Iterable[Optional[FieldTree]]) -> Optional[FieldTree]:
+    """Smallest tree covering all of `trees`; None (everything) absorbs the rest"""
+    merged: FieldTree = {}
+    for tree in trees:
+        if tree is None:
+            return None
+        _merge_into(merged, tree)
+    return merged or None
+
+def _merge_into(target: FieldTree, tree: FieldTree):
+    for name, subtree in tree.items():
+        if name in target and not target[name]:
+            continue
+        if not subtree:
+            target[name] = {}
+        else:
+            _merge_into(target.setdefault(name, {}), subtree)
+
+def selects(tree: Optional[FieldTree], path: str) -> bool:
+    """Whether anything at or below the dotted `path` is selected"""
+    node = tree
+    for part in path.split('.'):
+        if not node:
+            return True
+        if part not in node:
+            return False
+        node = node[part]
+    return True
+
+def project(data: Any, tree: Optional[FieldTree]) -> Any:
+    """Keep only the selected paths of `data`; paths into lists apply to every element"""
+    if not tree:
+        return data
+    if isinstance(data, dict):
+        return {name: project(data[name], subtree) for name, subtree in tree.items() if name in data}
+    if isinstance(data, list):
+        return [project(item, tree) for item in data]
+    return data
+
+def unknown_fields(tree: Optional[FieldTree], schema: Dict[str, Any]) -> List[str]:
+    """Paths of `tree` not present in `schema` (same shape; None marks a free-form subtree)"""
+    if tree is None:
+        return []
+    unknown = []
+    for name, subtree in tree.items():
+        if name not in schema:
+            unknown.append(name)
+        elif subtree and schema[name] is not None:
+            unknown.extend(f"{name}.{path}" for path in unknown_fields(subtree, schema[name]))
+    return unknown
@@ -0,0 +1,213 @@
+import asyncio
+import bisect
+import heapq
+import itertools
+import os
+import time
+from collections import deque
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from cluster import cluster
+from instrumentation import metrics_registry
+from lazy_components import aether_blockchain
+from response_cache import response_cache
+
+INGEST_COMMIT = metrics_registry.histogram(
+    'aether_ingest_commit_seconds', 'Time to seal one ingestion group into a block')
+INGEST_GROUP_SIZE = metrics_registry.histogram(
+    'aether_ingest_group_records', 'Records per committed ingestion group',
+    buckets=(1, 10, 100, 500, 1000, 2500, 5000, 10000))
+
+class IngestionQueueFull(Exception):
+    pass
+
+class IngestionQueue:
+    """Pending pool of vehicle records and the block producer that seals it.
+
+    Every accepted record gets a sequence number (its receipt) at once. The
+    producer task seals up to `max_batch` records into one Merkle-rooted
+    block as soon as that many are waiting, or `max_delay` seconds after the
+    first one arrived, whichever comes first, so mining cost is paid per
+    block rather than per record. Clients poll `status(seq)` or await
+    `wait(seq)`. `max_pending` bounds the pool.
+
+    The ledger outlives the process, so `start` continues numbering after
+    `last_sealed()`, and seqs no longer in the recent-group history are
+    looked up with `resolve(seq)`.
+    """
+
+    def __init__(self, commit: Callable[[List[Dict[str, Any]]], Optional[int]],
+                 max_batch: int = 5000, max_delay: float = 0.05, max_pending: int = 200000,
+                 history_size: int = 10000, last_sealed: Optional[Callable[[], int]] = None,
+                 resolve: Optional[Callable[[int], Optional[Dict[str, Any]]]] = None):
+        self.commit = commit
+        self.last_sealed = last_sealed
+        self.resolve = resolve
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.pending: deque = deque()
+        self.next_seq = 1
+        self.committed_seq = 0
+        self.failed_seq = 0
+        # Recent groups as parallel lists: first seq, last seq, block index (None = failed)
+        self.group_first: deque = deque(maxlen=history_size)
+        self.group_last: deque = deque(maxlen=history_size)
+        self.group_block: deque = deque(maxlen=history_size)
+        self.waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self.waiter_ids = itertools.count()
+        self.wakeup: Optional[asyncio.Event] = None
+        self.full: Optional[asyncio.Event] = None
+        self.task: Optional[asyncio.Task] = None
+        self.stopping = False
+        self.accepted = 0
+        self.committed = 0
+        self.failed = 0
+        self.groups = 0
+
+    def submit(self, records: List[Tuple[str, Dict[str, Any]]]) -> Tuple[int, int]:
+        """Queue (vehicle_id, data) records; returns the first and last assigned seq.
+        Ids are stringified here so no record can break the group it is sealed with."""
+        if len(self.pending) + len(records) > self.max_pending:
+            raise IngestionQueueFull(f"{len(self.pending)} records already pending")
+        first_seq = self.next_seq
+        for vehicle_id, data in records:
+            self.pending.append({'seq': self.next_seq, 'vehicle_id': str(vehicle_id), 'data': data})
+            self.next_seq += 1
+        self.accepted += len(records)
+        if self.wakeup is not None and records:
+            self.wakeup.set()
+            if len(self.pending) >= self.max_batch:
+                self.full.set()
+        return first_seq, self.next_seq - 1
+
+    def status(self, seq: int) -> Dict[str, Any]:
+        if seq <= 0 or seq >= self.next_seq:
+            return {'seq': seq, 'status': 'unknown'}
+        if seq > self.committed_seq and seq > self.failed_seq:
+            return {'seq': seq, 'status': 'pending', 'queue_position': seq - max(self.committed_seq, self.failed_seq)}
+        position = bisect.bisect_left(self.group_last, seq)
+        if position == len(self.group_last) or self.group_first[position] > seq:
+            resolved = self.resolve(seq) if self.resolve else None
+            return resolved or {'seq': seq, 'status': 'expired'}
+        block_index = self.group_block[position]
+        if block_index is None:
+            return {'seq': seq, 'status': 'failed'}
+        return {'seq': seq, 'status': 'committed', 'block_index': block_index,
+                'position': seq - self.group_first[position]}
+
+    async def wait(self, seq: int, timeout: float) -> Dict[str, Any]:
+        """Wait up to `timeout` seconds for seq to be committed (or to fail)"""
+        if self.status(seq)['status'] == 'pending':
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self.waiters, (seq, next(self.waiter_ids), future))
+            try:
+                await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.status(seq)
+
+    def start(self):
+        if self.last_sealed is not None:
+            sealed = self.last_sealed()
+            if sealed >= self.next_seq:
+                self.next_seq = sealed + 1
+                self.committed_seq = max(self.committed_seq, sealed)
+        if self.task is None:
+            self.wakeup = asyncio.Event()
+            self.full = asyncio.Event()
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Let the producer finish the group it is sealing, then commit whatever is still pending"""
+        if self.task is not None:
+            # Never cancel mid-commit: the worker thread would seal the block with nobody
+            # left to record the group, so its receipts would read as expired
+            self.stopping = True
+            self.wakeup.set()
+            self.full.set()
+            await self.task
+            self.task = None
+            self.stopping = False
+        while self.pending:
+            await self._commit_group()
+
+    async def _run(self):
+        while not self.stopping:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            # Let a group build up until it is full or max_delay has passed
+            if len(self.pending) < self.max_batch and not self.stopping:
+                self.full.clear()
+                try:
+                    await asyncio.wait_for(self.full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            while self.pending:
+                await self._commit_group()
+
+    async def _commit_group(self):
+        group = [self.pending.popleft() for _ in range(min(self.max_batch, len(self.pending)))]
+        started = time.perf_counter()
+        try:
+            block_index = await asyncio.to_thread(self.commit, group)
+        except Exception as e:
+            print(f"Ingestion commit error: {e}")
+            block_index = None
+        INGEST_COMMIT.observe(time.perf_counter() - started)
+        INGEST_GROUP_SIZE.observe(len(group))
+
+        last_seq = group[-1]['seq']
+        self.group_first.append(group[0]['seq'])
+        self.group_last.append(last_seq)
+        self.group_block.append(block_index)
+        self.groups += 1
+        if block_index is None:
+            self.failed_seq = last_seq
+            self.failed += len(group)
+        else:
+            self.committed_seq = last_seq
+            self.committed += len(group)
+            response_cache.invalidate('blockchain')
+        while self.waiters and self.waiters[0][0] <= last_seq:
+            future = heapq.heappop(self.waiters)[2]
+            if not future.done():
+                future.set_result(None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'pending': len(self.pending),
+            'accepted': self.accepted,
+            'committed': self.committed,
+            'failed': self.failed,
+            'groups': self.groups,
+            'avg_group_size': round(self.committed / self.groups, 1) if self.groups else 0,
+            'last_seq': self.next_seq - 1,
+            'committed_seq': self.committed_seq,
+            'max_batch': self.max_batch,
+            'max_delay': self.max_delay,
+            'waiters': len(self.waiters)
+        }
+
+def commit_to_ledger(records: List[Dict[str, Any]]) -> Optional[int]:
+    """Seal one group as a single block on the (possibly shared) chain"""
+    return cluster.commit(aether_blockchain, lambda: aether_blockchain.add_vehicle_batch(records))
+
+def resolve_from_ledger(seq: int) -> Optional[Dict[str, Any]]:
+    """Status of a seq sealed before the recent-group history (e.g. before a restart)"""
+    if not aether_blockchain.index_ready:
+        return {'seq': seq, 'status': 'indexing'}
+    located = aether_blockchain.locate_seq(seq)
+    if located is None:
+        return None
+    return {'seq': seq, 'status': 'committed', 'block_index': located[0], 'position': located[1]}
+
+# Global ingestion queue instance
+ingestion_queue = IngestionQueue(
+    commit_to_ledger,
+    last_sealed=lambda: aether_blockchain.last_sealed_seq(),
+    resolve=resolve_from_ledger,
+    max_batch=int(os.environ.get('AETHER_INGEST_MAX_BATCH', '5000')),
+    max_delay=float(os.environ.get('AETHER_INGEST_MAX_DELAY', '0.05')),
+    max_pending=int(os.environ.get('AETHER_INGEST_MAX_PENDING', '200000'))
+)
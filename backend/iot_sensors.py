@@ -267,6 +267,3 @@ class RadarSensor:
             },
             'status': 'active'
         }
-
-# Global IoT sensor manager
-iot_manager = IoTSensorManager()
\ No newline at end of file
@@ -0,0 +1,130 @@
+import asyncio
+import os
+import time
+from typing import Dict, Any, Iterable, Optional, Sequence
+
+from instrumentation import metrics_registry
+
+LOOP_LAG = metrics_registry.histogram(
+    'aether_event_loop_lag_seconds', 'Delay between when the lag probe should wake and when it ran',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+
+LEVEL_NAMES = ('normal', 'stretch_intervals', 'shed_topics', 'reject_connections')
+
+class LoadShedder:
+    """Event-loop lag monitor driving a graded degradation policy.
+
+    A probe task sleeps for `interval` and measures how late it wakes up.
+    The smoothed lag is compared against `thresholds` (one per level above
+    normal), and each level keeps the measures of the ones below it:
+
+    1. push intervals are multiplied by `stretch_factor`
+    2. `low_priority` topics/sections are no longer computed
+    3. new WebSocket connections are refused with a retry-after hint
+
+    Escalation is immediate; the level steps down one at a time after the
+    lag has stayed below that level's threshold for `recover_after` seconds.
+    """
+
+    def __init__(self, thresholds: Sequence[float] = (0.05, 0.2, 0.5), interval: float = 0.25,
+                 recover_after: float = 5.0, stretch_factor: float = 2.0,
+                 low_priority: Iterable[str] = ('device_information', 'quantum_encryption'),
+                 retry_after: int = 10, smoothing: float = 0.3):
+        self.thresholds = sorted(thresholds)[:len(LEVEL_NAMES) - 1]
+        self.interval = interval
+        self.recover_after = recover_after
+        self.stretch_factor = stretch_factor
+        self.low_priority = frozenset(low_priority)
+        self.retry_after = retry_after
+        self.smoothing = smoothing
+        self.level = 0
+        self.lag = 0.0
+        self.smoothed_lag = 0.0
+        self.max_lag = 0.0
+        self.calm_since: Optional[float] = None
+        self.level_changes = 0
+        self.rejected_connections = 0
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.record_lag(max(0.0, loop.time() - started - self.interval))
+
+    def record_lag(self, lag: float):
+        self.lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.smoothed_lag += self.smoothing * (lag - self.smoothed_lag)
+        LOOP_LAG.observe(lag)
+
+        target = sum(1 for threshold in self.thresholds if self.smoothed_lag >= threshold)
+        now = time.monotonic()
+        if target >= self.level:
+            self.calm_since = None
+            if target > self.level:
+                self._set_level(target)
+        elif self.calm_since is None:
+            self.calm_since = now
+        elif now - self.calm_since >= self.recover_after:
+            self._set_level(self.level - 1)
+            self.calm_since = now
+
+    def _set_level(self, level: int):
+        print(f"Load shedding: {LEVEL_NAMES[self.level]} -> {LEVEL_NAMES[level]} "
+              f"(event loop lag {self.smoothed_lag * 1000:.0f}ms)")
+        self.level = level
+        self.level_changes += 1
+
+    def stretch(self, interval: float) -> float:
+        """Push interval to use at the current level"""
+        return interval * self.stretch_factor if self.level >= 1 else interval
+
+    def allows(self, topic: str) -> bool:
+        return self.level < 2 or topic not in self.low_priority
+
+    def accepts_connections(self) -> bool:
+        return self.level < 3
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'level': self.level,
+            'state': LEVEL_NAMES[self.level],
+            'lag_ms': round(self.lag * 1000, 2),
+            'smoothed_lag_ms': round(self.smoothed_lag * 1000, 2),
+            'max_lag_ms': round(self.max_lag * 1000, 2),
+            'thresholds_ms': [round(threshold * 1000, 2) for threshold in self.thresholds],
+            'stretch_factor': self.stretch_factor,
+            'low_priority': sorted(self.low_priority),
+            'level_changes': self.level_changes,
+            'rejected_connections': self.rejected_connections
+        }
+
+# Global load shedder instance
+load_shedder = LoadShedder(
+    thresholds=[float(value) for value in os.environ.get('AETHER_LAG_THRESHOLDS', '0.05,0.2,0.5').split(',')],
+    recover_after=float(os.environ.get('AETHER_LAG_RECOVER_SECONDS', '5')),
+    stretch_factor=float(os.environ.get('AETHER_SHED_STRETCH_FACTOR', '2')),
+    low_priority=[topic for topic in os.environ.get(
+        'AETHER_SHED_TOPICS', 'device_information,quantum_encryption').split(',') if topic],
+    retry_after=int(os.environ.get('AETHER_SHED_RETRY_AFTER', '10'))
+)
+
+metrics_registry.callback('aether_event_loop_lag_smoothed_seconds', 'Smoothed event loop lag',
+                          lambda: load_shedder.smoothed_lag)
+metrics_registry.callback('aether_degradation_level', 'Load shedding level (0 = full service)',
+                          lambda: load_shedder.level)
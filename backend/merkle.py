@@ -0,0 +1,85 @@
+import hashlib
+import json
+import sys
+from typing import Dict, Any, List
+
+# Standalone on purpose: auditors can copy this file and check a proof from
+# /api/aether/blockchain/proof without the rest of AETHER.
+
+# Domain separation keeps a leaf from ever hashing like an interior node
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+def leaf_hash(record: Any) -> str:
+    """Hash of one record as it is stored in a block (canonical JSON)"""
+    return hashlib.sha256(LEAF_PREFIX + json.dumps(record, sort_keys=True).encode()).hexdigest()
+
+def node_hash(left: str, right: str) -> str:
+    return hashlib.sha256(NODE_PREFIX + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+def merkle_levels(leaves: List[str]) -> List[List[str]]:
+    """All tree levels from the leaves up to the root. An odd node out is
+    promoted to the next level unchanged rather than paired with itself."""
+    if not leaves:
+        return [[hashlib.sha256(b'').hexdigest()]]
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+def merkle_root(leaves: List[str]) -> str:
+    return merkle_levels(leaves)[-1][0]
+
+def inclusion_proof(levels: List[List[str]], position: int) -> List[Dict[str, str]]:
+    """Sibling hashes from leaf `position` up to the root, each with the side it sits on"""
+    proof = []
+    for level in levels[:-1]:
+        sibling = position ^ 1
+        if sibling < len(level):
+            proof.append({'side': 'left' if sibling < position else 'right', 'hash': level[sibling]})
+        position //= 2
+    return proof
+
+def root_from_proof(leaf: str, proof: List[Dict[str, str]]) -> str:
+    current = leaf
+    for step in proof:
+        current = node_hash(step['hash'], current) if step['side'] == 'left' else node_hash(current, step['hash'])
+    return current
+
+def verify_inclusion(record: Any, proof: List[Dict[str, str]], root: str) -> bool:
+    """Whether `record` is one of the leaves under `root`"""
+    return root_from_proof(leaf_hash(record), proof) == root
+
+def block_hash(header: Dict[str, Any]) -> str:
+    """The block hash over index, timestamp, data, previous_hash and nonce (canonical JSON).
+    For Merkle-rooted blocks `data` is the header data, which holds the root and not the records."""
+    return hashlib.sha256(json.dumps({
+        "index": header["index"],
+        "timestamp": header["timestamp"],
+        "data": header["data"],
+        "previous_hash": header["previous_hash"],
+        "nonce": header["nonce"]
+    }, sort_keys=True).encode()).hexdigest()
+
+def verify_record_proof(bundle: Dict[str, Any]) -> Dict[str, bool]:
+    """Check a proof bundle: the record is under the root, the root is in the block
+    header, and the header hashes to the block hash"""
+    block = bundle['block']
+    checks = {
+        'record_in_root': verify_inclusion(bundle['record'], bundle['proof'], bundle['merkle_root']),
+        'root_in_block': block['data'].get('merkle_root') == bundle['merkle_root'],
+        'block_hash': block_hash(block) == block['hash']
+    }
+    checks['valid'] = all(checks.values())
+    return checks
+
+if __name__ == "__main__":
+    # python merkle.py proof.json   (or pipe the proof endpoint's JSON on stdin)
+    with (open(sys.argv[1]) if len(sys.argv) > 1 else sys.stdin) as source:
+        result = verify_record_proof(json.load(source))
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if result['valid'] else 1)
@@ -0,0 +1,149 @@
+import os
+import platform
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+import psutil
+
+class SystemMetricsSampler:
+    """Samples system metrics on a background thread into a fixed-size ring buffer.
+
+    Readers never touch psutil: `get_latest()` returns the most recent sample
+    in O(1), so async handlers no longer block the event loop.
+    """
+
+    def __init__(self, interval: float = 1.0, history_size: int = 120):
+        self.interval = interval
+        self.samples = deque(maxlen=history_size)
+        self.latest: Optional[Dict[str, Any]] = None
+        self.is_running = False
+        self.sample_thread = None
+        self.lock = threading.Lock()
+        self.start_lock = threading.Lock()
+        self._first_sample = threading.Event()
+        self._stop_event = threading.Event()
+        self._previous_counters = None
+        self._disk_path = 'C:\\' if platform.system() == 'Windows' else '/'
+
+    def start(self):
+        # get_latest() may start the sampler from several threads at once
+        with self.start_lock:
+            if self.is_running:
+                return
+            # The first non-blocking cpu_percent() call only primes psutil's counters
+            psutil.cpu_percent(interval=None)
+            self.is_running = True
+            self._stop_event.clear()
+            self.sample_thread = threading.Thread(target=self._sampling_loop)
+            self.sample_thread.daemon = True
+            self.sample_thread.start()
+
+    def stop(self):
+        self.is_running = False
+        self._stop_event.set()
+        if self.sample_thread:
+            self.sample_thread.join()
+            self.sample_thread = None
+
+    def _sampling_loop(self):
+        # Give cpu_percent() a measurement window before the first sample
+        self._stop_event.wait(min(self.interval, 0.1))
+        self._record(self._take_sample())
+        while not self._stop_event.wait(self.interval):
+            self._record(self._take_sample())
+
+    def _record(self, sample: Dict[str, Any]):
+        with self.lock:
+            self.samples.append(sample)
+            self.latest = sample
+        self._first_sample.set()
+
+    def _take_sample(self) -> Dict[str, Any]:
+        try:
+            now = time.time()
+            memory = psutil.virtual_memory()
+            disk = psutil.disk_usage(self._disk_path)
+            network = psutil.net_io_counters()
+            disk_io = psutil.disk_io_counters()
+            counters = {
+                'time': now,
+                'network_sent': network.bytes_sent,
+                'network_recv': network.bytes_recv,
+                'disk_read': disk_io.read_bytes if disk_io else 0,
+                'disk_write': disk_io.write_bytes if disk_io else 0
+            }
+            rates = self._calculate_rates(counters)
+            self._previous_counters = counters
+
+            return {
+                'cpu_usage': psutil.cpu_percent(interval=None),
+                'memory_usage': memory.percent,
+                'disk_usage': disk.percent,
+                'network_sent': network.bytes_sent,
+                'network_recv': network.bytes_recv,
+                'processes': len(psutil.pids()),
+                'boot_time': psutil.boot_time(),
+                **rates,
+                'sampled_at': datetime.fromtimestamp(now).isoformat()
+            }
+        except Exception:
+            return {
+                'cpu_usage': 0,
+                'memory_usage': 0,
+                'disk_usage': 0,
+                'network_sent': 0,
+                'network_recv': 0,
+                'processes': 0,
+                'boot_time': 0,
+                'network_sent_rate': 0.0,
+                'network_recv_rate': 0.0,
+                'disk_read_rate': 0.0,
+                'disk_write_rate': 0.0,
+                'sampled_at': datetime.now().isoformat(),
+                'error': 'Metrics unavailable'
+            }
+
+    def _calculate_rates(self, counters: Dict[str, float]) -> Dict[str, float]:
+        previous = self._previous_counters
+        elapsed = counters['time'] - previous['time'] if previous else 0
+        if elapsed <= 0:
+            return {
+                'network_sent_rate': 0.0,
+                'network_recv_rate': 0.0,
+                'disk_read_rate': 0.0,
+                'disk_write_rate': 0.0
+            }
+
+        def rate(key: str) -> float:
+            # Counters can wrap or reset (e.g. NIC restart); never report negative rates
+            return round(max(0, counters[key] - previous[key]) / elapsed, 1)
+
+        return {
+            'network_sent_rate': rate('network_sent'),
+            'network_recv_rate': rate('network_recv'),
+            'disk_read_rate': rate('disk_read'),
+            'disk_write_rate': rate('disk_write')
+        }
+
+    def get_latest(self) -> Dict[str, Any]:
+        """Return the most recent sample; only the very first call waits for one"""
+        if self.latest is None:
+            self.start()
+            self._first_sample.wait(self.interval + 1)
+        return self.latest
+
+    def get_history(self, count: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return up to `count` most recent samples, oldest first"""
+        with self.lock:
+            history = list(self.samples)
+        if count is not None:
+            history = history[-count:]
+        return history
+
+# Global metrics sampler instance
+metrics_sampler = SystemMetricsSampler(
+    interval=float(os.environ.get('AETHER_METRICS_INTERVAL', '1.0')),
+    history_size=int(os.environ.get('AETHER_METRICS_HISTORY', '120'))
+)
@@ -4,6 +4,8 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 import asyncio
 
+from single_flight import request_coalescer
+
 class RealTimeWeatherService:
     def __init__(self):
         # Using OpenWeatherMap API (free tier)
@@ -19,6 +21,10 @@ class RealTimeWeatherService:
         if self.is_cache_valid(cache_key):
             return self.cache[cache_key]["data"]
         
+        # Concurrent cache misses for the same location share one lookup
+        return await request_coalescer.do('weather.current', cache_key, self._fetch_current_weather, lat, lon, cache_key)
+    
+    async def _fetch_current_weather(self, lat: float, lon: float, cache_key: str) -> Dict[str, Any]:
         try:
             # For demo, using realistic weather simulation based on location
             weather_data = self.simulate_realistic_weather(lat, lon)
@@ -138,6 +144,3 @@ class RealTimeWeatherService:
             "timestamp": datetime.now().isoformat(),
             "source": "fallback"
         }
-
-# Global weather service instance
-weather_service = RealTimeWeatherService()
\ No newline at end of file
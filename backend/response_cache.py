@@ -0,0 +1,104 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+class CachePolicy:
+    def __init__(self, path: str, ttl: float, tags: Iterable[str] = ()):
+        self.path = path
+        self.ttl = ttl
+        self.tags = set(tags)
+
+class CachedResponse:
+    def __init__(self, body: bytes, status_code: int, headers: Dict[str, str], ttl: float, tags: Iterable[str]):
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.expires_at = time.monotonic() + ttl
+        self.tags = set(tags)
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+class ResponseCache:
+    """TTL cache for GET responses with strong ETags and tag-based invalidation.
+
+    Routes opt in with `configure(path, ttl, tags)`; a path ending in '/'
+    covers everything below it. Writes that change the underlying data call
+    `invalidate(tag)` so cached bodies never outlive the state they describe.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.policies: Dict[str, CachePolicy] = {}
+        self.entries: 'OrderedDict[Tuple[str, str, str], CachedResponse]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    def configure(self, path: str, ttl: float, tags: Iterable[str] = ()):
+        self.policies[path] = CachePolicy(path, ttl, tags)
+
+    def policy_for(self, path: str) -> Optional[CachePolicy]:
+        policy = self.policies.get(path)
+        if policy is not None:
+            return policy
+        prefixes = [prefix for prefix in self.policies if prefix.endswith('/') and path.startswith(prefix)]
+        return self.policies[max(prefixes, key=len)] if prefixes else None
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[CachedResponse]:
+        entry = self.entries.get(key)
+        if entry is None or not entry.is_fresh():
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Tuple[str, str, str], body: bytes, status_code: int,
+            headers: Dict[str, str], policy: CachePolicy) -> CachedResponse:
+        entry = CachedResponse(body, status_code, headers, policy.ttl, policy.tags)
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, *tags: str) -> int:
+        """Drop every cached entry carrying any of the given tags"""
+        stale = [key for key, entry in self.entries.items() if entry.tags.intersection(tags)]
+        for key in stale:
+            del self.entries[key]
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self):
+        self.entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'not_modified': self.not_modified,
+            'invalidations': self.invalidations,
+            'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+            'routes': {path: {'ttl': policy.ttl, 'tags': sorted(policy.tags)}
+                       for path, policy in self.policies.items()}
+        }
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    candidates: List[str] = [value.strip() for value in if_none_match.split(',')]
+    candidates = [value[2:] if value.startswith('W/') else value for value in candidates]
+    return '*' in candidates or etag in candidates
+
+# Global response cache instance
+response_cache = ResponseCache()
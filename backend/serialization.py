@@ -0,0 +1,143 @@
+import json
+from contextvars import ContextVar
+from datetime import datetime, date
+from typing import Dict, Any, List, Optional, Union
+
+from fastapi.responses import JSONResponse
+
+# Optional fast / binary encoders; stdlib json is always available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+def _fallback(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, 'tolist'):  # numpy scalars and arrays
+        return value.tolist()
+    return str(value)
+
+def encode_json(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, default=_fallback,
+                            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, default=_fallback, separators=(',', ':')).encode()
+
+def encode_stdlib_json(data: Any) -> bytes:
+    return json.dumps(data, default=_fallback).encode()
+
+def encode_msgpack(data: Any) -> bytes:
+    return msgpack.packb(data, default=_fallback, use_bin_type=True)
+
+def encode_cbor(data: Any) -> bytes:
+    return cbor2.dumps(data, default=lambda encoder, value: encoder.encode(_fallback(value)))
+
+# name -> (media type, websocket subprotocol, encoder, available)
+ENCODINGS = {
+    'json': ('application/json', 'aether.json', encode_json, True),
+    'msgpack': ('application/msgpack', 'aether.msgpack', encode_msgpack, msgpack is not None),
+    'cbor': ('application/cbor', 'aether.cbor', encode_cbor, cbor2 is not None)
+}
+
+MEDIA_TYPE_ALIASES = {
+    'application/x-msgpack': 'msgpack',
+    'application/vnd.msgpack': 'msgpack'
+}
+
+def available_encodings() -> List[str]:
+    return [name for name, (_, _, _, available) in ENCODINGS.items() if available]
+
+def json_backend() -> str:
+    return 'orjson' if orjson is not None else 'stdlib'
+
+def encode(data: Any, encoding: str = 'json') -> bytes:
+    return ENCODINGS[encoding][2](data)
+
+def encode_frame(data: Any, encoding: str = 'json') -> Union[str, bytes]:
+    """WebSocket payload: text frames for JSON, binary frames otherwise"""
+    payload = encode(data, encoding)
+    return payload.decode() if encoding == 'json' else payload
+
+def decode(payload: Union[str, bytes], encoding: str = 'json') -> Any:
+    if encoding == 'msgpack':
+        return msgpack.unpackb(payload, raw=False)
+    if encoding == 'cbor':
+        return cbor2.loads(payload)
+    return orjson.loads(payload) if orjson is not None else json.loads(payload)
+
+def negotiate(accept: Optional[str]) -> str:
+    """Pick the best available encoding for an HTTP Accept header (JSON by default)"""
+    if not accept:
+        return 'json'
+
+    candidates = []
+    for position, part in enumerate(accept.split(',')):
+        media_type, *params = [item.strip() for item in part.split(';')]
+        quality = 1.0
+        for param in params:
+            if param.startswith('q='):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        candidates.append((-quality, position, media_type.lower()))
+
+    for quality, _, media_type in sorted(candidates):
+        if quality == 0:
+            continue
+        name = MEDIA_TYPE_ALIASES.get(media_type)
+        if name is None:
+            name = next((key for key, spec in ENCODINGS.items() if spec[0] == media_type), None)
+        if name is None and media_type in ('*/*', 'application/*'):
+            name = 'json'
+        if name is not None and ENCODINGS[name][3]:
+            return name
+    return 'json'
+
+def negotiate_subprotocol(requested: List[str]) -> Optional[str]:
+    """First WebSocket subprotocol offered by the client that we can serve"""
+    for subprotocol in requested:
+        for name, (_, offered, _, available) in ENCODINGS.items():
+            if subprotocol == offered and available:
+                return name
+    return None
+
+def subprotocol_for(encoding: str) -> str:
+    return ENCODINGS[encoding][1]
+
+class EncodedFrame:
+    """One payload, serialized at most once per encoding and shared by every client"""
+
+    def __init__(self, data: Any):
+        self.data = data
+        self._payloads: Dict[str, Union[str, bytes]] = {}
+
+    def get(self, encoding: str = 'json') -> Union[str, bytes]:
+        if encoding not in self._payloads:
+            self._payloads[encoding] = encode_frame(self.data, encoding)
+        return self._payloads[encoding]
+
+# Encoding negotiated for the current HTTP request (set by the negotiation middleware)
+response_encoding: ContextVar[str] = ContextVar('response_encoding', default='json')
+
+class NegotiatedResponse(JSONResponse):
+    """JSON response that honours the negotiated encoding and uses the fast JSON backend"""
+
+    def __init__(self, content: Any, status_code: int = 200, *args, **kwargs):
+        self.encoding = response_encoding.get()
+        self.media_type = ENCODINGS[self.encoding][0]
+        super().__init__(content, status_code, *args, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        return encode(content, self.encoding)
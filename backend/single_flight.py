@@ -0,0 +1,43 @@
+import asyncio
+from typing import Dict, Any, Awaitable, Callable, Hashable, Tuple
+
+class SingleFlight:
+    """Coalesces concurrent identical calls into one in-flight computation.
+
+    Calls are keyed by (name, params). While a computation for a key is
+    running, every other caller awaits the same task and shares its result
+    (or exception). The task is shielded, so a caller that goes away does
+    not cancel the work for the rest.
+    """
+
+    def __init__(self):
+        self.in_flight: Dict[Tuple[str, Hashable], asyncio.Task] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    async def do(self, name: str, params: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        key = (name, params)
+        stats = self.stats.setdefault(name, {'calls': 0, 'executions': 0})
+        stats['calls'] += 1
+
+        task = self.in_flight.get(key)
+        if task is None:
+            stats['executions'] += 1
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            self.in_flight[key] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def get_stats(self) -> Dict[str, Any]:
+        per_name = {}
+        for name, stats in self.stats.items():
+            calls, executions = stats['calls'], stats['executions']
+            per_name[name] = {
+                'calls': calls,
+                'executions': executions,
+                'coalesced': calls - executions,
+                'coalescing_ratio': round((calls - executions) / calls, 3) if calls else 0.0
+            }
+        return {'in_flight': len(self.in_flight), 'keys': per_name}
+
+# Global request coalescer instance
+request_coalescer = SingleFlight()
@@ -0,0 +1,105 @@
+import asyncio
+import inspect
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Iterable, Optional, Tuple
+
+from instrumentation import SECTION_LATENCY
+
+class SnapshotSource:
+    def __init__(self, name: str, func: Callable[[], Any], timeout: float):
+        self.name = name
+        self.func = func
+        self.timeout = timeout
+        self.is_async = inspect.iscoroutinefunction(func)
+        # Thread-pool call still in flight (a sync source that overran is not resubmitted)
+        self.running: Optional[asyncio.Future] = None
+
+class SnapshotAssembler:
+    """Gathers snapshot sections concurrently, each under its own deadline.
+
+    Sync sources run on a bounded thread pool, async sources on the event
+    loop. A source that raises or misses its deadline only loses its own
+    section; the result carries a per-section status and latency. A thread
+    cannot be cancelled, so a sync source whose previous call is still
+    running is waited on rather than run again, and reports `busy` if that
+    call misses this deadline too; a hung source ties up one worker, not
+    the whole pool.
+    """
+
+    def __init__(self, max_workers: int = 8, default_timeout: float = 1.0):
+        self.sources: Dict[str, SnapshotSource] = {}
+        self.default_timeout = default_timeout
+        self.max_workers = max_workers
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    def register(self, name: str, func: Callable[[], Any], timeout: Optional[float] = None):
+        self.sources[name] = SnapshotSource(name, func, timeout or self.default_timeout)
+
+    async def _run_source(self, source: SnapshotSource) -> Tuple[str, Dict[str, Any], Any]:
+        started = time.perf_counter()
+        value = None
+        joined = False
+        try:
+            if source.is_async:
+                value = await asyncio.wait_for(source.func(), source.timeout)
+            else:
+                joined = source.running is not None
+                if not joined:
+                    source.running = asyncio.get_running_loop().run_in_executor(self._executor(), source.func)
+                    source.running.add_done_callback(lambda future: self._finished(source, future))
+                value = await asyncio.wait_for(asyncio.shield(source.running), source.timeout)
+            status = {'status': 'ok'}
+        except asyncio.TimeoutError:
+            if joined:
+                status = {'status': 'busy', 'error': 'Previous call still running'}
+            else:
+                status = {'status': 'timeout', 'error': f'Exceeded {source.timeout:.2f}s deadline'}
+        except Exception as e:
+            status = {'status': 'error', 'error': str(e)[:100]}
+        elapsed = time.perf_counter() - started
+        SECTION_LATENCY.observe(elapsed, section=source.name, status=status['status'])
+        status['latency_ms'] = round(elapsed * 1000, 2)
+        return source.name, status, value
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='aether-snapshot')
+        return self.executor
+
+    @staticmethod
+    def _finished(source: SnapshotSource, future: asyncio.Future):
+        if source.running is future:
+            source.running = None
+        if not future.cancelled():
+            # Mark an abandoned call's exception as retrieved
+            future.exception()
+
+    async def assemble(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Run the requested sources (all by default) and collect finished sections"""
+        selected = [self.sources[name] for name in (names if names is not None else self.sources)
+                    if name in self.sources]
+        results = await asyncio.gather(*(self._run_source(source) for source in selected))
+
+        sections = {}
+        section_status = {}
+        for name, status, value in results:
+            section_status[name] = status
+            if status['status'] == 'ok':
+                sections[name] = value
+        return {'sections': sections, 'section_status': section_status}
+
+    def shutdown(self):
+        """Release the pool; the next assemble (e.g. a later lifespan) starts a fresh one"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        for source in self.sources.values():
+            source.running = None
+
+# Global snapshot assembler instance
+snapshot_assembler = SnapshotAssembler(
+    max_workers=int(os.environ.get('AETHER_SNAPSHOT_WORKERS', '8')),
+    default_timeout=float(os.environ.get('AETHER_SNAPSHOT_TIMEOUT', '1.0'))
+)
@@ -0,0 +1,209 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Any, List, Tuple
+
+class StateBackend(ABC):
+    """Key-value, append-only stream and lease storage for the API workers.
+
+    `shared` is True when several processes see the same state; the
+    cluster coordinator uses it to decide whether workers need to elect a
+    leader and exchange state at all.
+    """
+
+    shared = False
+
+    @abstractmethod
+    def get(self, key: str, default: Any = None) -> Any:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any):
+        pass
+
+    @abstractmethod
+    def append(self, stream: str, item: Any) -> int:
+        """Append an item and return its sequence number (1-based, per stream)"""
+
+    @abstractmethod
+    def read_stream(self, stream: str, after_seq: int = 0, limit: int = 1000) -> List[Tuple[int, Any]]:
+        pass
+
+    @abstractmethod
+    def last_seq(self, stream: str) -> int:
+        pass
+
+    @abstractmethod
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """Take or renew a named lease; False while another owner holds it"""
+
+    @abstractmethod
+    def release_lease(self, name: str, owner: str):
+        pass
+
+    @contextmanager
+    def lock(self, name: str, timeout: float = 10.0, ttl: float = 10.0):
+        """Mutual exclusion across every worker sharing this backend"""
+        owner = f"{os.getpid()}:{threading.get_ident()}"
+        deadline = time.monotonic() + timeout
+        while not self.acquire_lease(name, owner, ttl):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Could not acquire lock '{name}' within {timeout}s")
+            time.sleep(0.005)
+        try:
+            yield
+        finally:
+            self.release_lease(name, owner)
+
+    def close(self):
+        pass
+
+class LocalStateBackend(StateBackend):
+    """In-process state for a single worker; no files, no network"""
+
+    def __init__(self):
+        self.values: Dict[str, Any] = {}
+        self.streams: Dict[str, List[Any]] = {}
+        self.leases: Dict[str, Tuple[str, float]] = {}
+        self.state_lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.values.get(key, default)
+
+    def set(self, key: str, value: Any):
+        self.values[key] = value
+
+    def append(self, stream: str, item: Any) -> int:
+        with self.state_lock:
+            items = self.streams.setdefault(stream, [])
+            items.append(item)
+            return len(items)
+
+    def read_stream(self, stream: str, after_seq: int = 0, limit: int = 1000) -> List[Tuple[int, Any]]:
+        with self.state_lock:
+            items = self.streams.get(stream, [])[after_seq:after_seq + limit]
+        return list(enumerate(items, start=after_seq + 1))
+
+    def last_seq(self, stream: str) -> int:
+        return len(self.streams.get(stream, []))
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self.state_lock:
+            holder = self.leases.get(name)
+            if holder and holder[0] != owner and holder[1] > now:
+                return False
+            self.leases[name] = (owner, now + ttl)
+            return True
+
+    def release_lease(self, name: str, owner: str):
+        with self.state_lock:
+            if self.leases.get(name, (None,))[0] == owner:
+                del self.leases[name]
+
+class SQLiteStateBackend(StateBackend):
+    """State shared by every worker on one host through a SQLite file in WAL mode.
+
+    WAL lets readers proceed while one writer commits, which suits the
+    read-mostly traffic here. Each thread gets its own connection.
+    """
+
+    shared = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL);
+        CREATE TABLE IF NOT EXISTS streams (stream TEXT NOT NULL, seq INTEGER NOT NULL, item TEXT NOT NULL,
+                                            created_at REAL NOT NULL, PRIMARY KEY (stream, seq));
+        CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL);
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.local = threading.local()
+        self.schema_ready = False
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if not self.schema_ready:
+                conn.executescript(self.SCHEMA)
+                self.schema_ready = True
+            self.local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, key: str, default: Any = None) -> Any:
+        row = self._conn().execute("SELECT value FROM kv WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set(self, key: str, value: Any):
+        self._conn().execute(
+            "INSERT INTO kv (key, value, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+            (key, json.dumps(value, default=str), time.time()))
+
+    def append(self, stream: str, item: Any) -> int:
+        payload = json.dumps(item, default=str)
+        with self._transaction() as conn:
+            seq = conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM streams WHERE stream = ?",
+                               (stream,)).fetchone()[0]
+            conn.execute("INSERT INTO streams (stream, seq, item, created_at) VALUES (?, ?, ?, ?)",
+                         (stream, seq, payload, time.time()))
+        return seq
+
+    def read_stream(self, stream: str, after_seq: int = 0, limit: int = 1000) -> List[Tuple[int, Any]]:
+        rows = self._conn().execute(
+            "SELECT seq, item FROM streams WHERE stream = ? AND seq > ? ORDER BY seq LIMIT ?",
+            (stream, after_seq, limit)).fetchall()
+        return [(seq, json.loads(item)) for seq, item in rows]
+
+    def last_seq(self, stream: str) -> int:
+        return self._conn().execute("SELECT COALESCE(MAX(seq), 0) FROM streams WHERE stream = ?",
+                                    (stream,)).fetchone()[0]
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT owner, expires_at FROM leases WHERE name = ?", (name,)).fetchone()
+            if row and row[0] != owner and row[1] > now:
+                return False
+            conn.execute("INSERT OR REPLACE INTO leases (name, owner, expires_at) VALUES (?, ?, ?)",
+                         (name, owner, now + ttl))
+            return True
+
+    def release_lease(self, name: str, owner: str):
+        self._conn().execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+
+    def close(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
+
+def create_state_backend() -> StateBackend:
+    """Pick the backend from AETHER_STATE_BACKEND ('local' or 'sqlite')"""
+    kind = os.environ.get('AETHER_STATE_BACKEND', 'local').lower()
+    if kind == 'sqlite':
+        return SQLiteStateBackend(os.environ.get('AETHER_STATE_PATH', 'aether_state.db'))
+    return LocalStateBackend()
+
+# Global state backend instance
+state_backend = create_state_backend()
@@ -1,5 +1,4 @@
 import json
-import time
 import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
@@ -47,19 +46,30 @@ class SwarmIntelligence:
             'hazards': [],
             'optimal_routes': {}
         }
-        self.coordination_active = True
+        self.coordination_active = False
         self.update_thread = None
-        self.start_coordination()
+        self._stop_event = threading.Event()
+        self._initialize_demo_vehicles()
         
     def start_coordination(self):
-        # Initialize demo vehicles
-        self._initialize_demo_vehicles()
+        if self.coordination_active:
+            return
+        self.coordination_active = True
+        self._stop_event.clear()
         
         # Start coordination thread
         self.update_thread = threading.Thread(target=self._coordination_loop)
         self.update_thread.daemon = True
         self.update_thread.start()
         
+    def stop_coordination(self):
+        # Wait for the loop to exit so a quick restart never runs two loops at once
+        self.coordination_active = False
+        self._stop_event.set()
+        if self.update_thread:
+            self.update_thread.join()
+            self.update_thread = None
+        
     def _initialize_demo_vehicles(self):
         # Create demo vehicles around Delhi
         base_positions = [
@@ -80,10 +90,10 @@ class SwarmIntelligence:
                 self._update_swarm_intelligence()
                 self._optimize_routes()
                 self._share_knowledge()
-                time.sleep(2)  # Update every 2 seconds
+                self._stop_event.wait(2)  # Update every 2 seconds
             except Exception as e:
                 print(f"Swarm coordination error: {e}")
-                time.sleep(5)
+                self._stop_event.wait(5)
                 
     def _update_swarm_intelligence(self):
         # Simulate vehicle movement and data collection
@@ -1,11 +1,11 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response
 import uvicorn
-import json
 import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union
 import psutil
 import platform
 import socket
@@ -18,15 +18,114 @@ import math
 from pathlib import Path
 
 # Import new AETHER modules
-from blockchain_security import aether_blockchain
-from real_time_weather import weather_service
-from advanced_ai_models import ai_predictor
-from iot_sensors import iot_manager
-from swarm_intelligence import swarm_intelligence
-from device_info import device_manager
+from lazy_components import (
+    components, aether_blockchain, weather_service, ai_predictor,
+    iot_manager, swarm_intelligence, device_manager
+)
+from metrics_sampler import metrics_sampler
+from cluster import cluster
+from alert_store import alert_store
+from ingestion import IngestionQueueFull, ingestion_queue
+from load_shedding import load_shedder
+from blocking_detector import blocking_detector
+from snapshot_assembler import snapshot_assembler
+from delta_protocol import DeltaStream
+from field_projection import FieldTree, format_fields, merge_fields, parse_fields, project, selects, unknown_fields
+from client_session import ClientSession
+from compression import (
+    COMPRESSION_SETTINGS, CompressionMiddleware, DEFLATE_SUFFIX, FrameCompressor, WS_DEFLATE_LEVEL,
+    negotiate_ws_compression
+)
+from response_cache import response_cache, etag_matches
+from single_flight import request_coalescer
+from instrumentation import ALERT_DELIVERY, PrometheusMiddleware, WS_FRAME_BUILD, metrics_registry
+from serialization import (
+    EncodedFrame, NegotiatedResponse, decode, encode_frame, negotiate,
+    response_encoding, subprotocol_for
+)
+
+SIMULATIONS = ['iot_manager', 'swarm_intelligence']
+
+async def start_simulations():
+    await components.start_all(SIMULATIONS)
+
+async def stop_simulations():
+    await components.stop_all(SIMULATIONS)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build and start the background components; stop them on shutdown"""
+    if blocking_detector.enabled:
+        blocking_detector.start()
+    metrics_sampler.start()
+    load_shedder.start()
+    await components.start_all([name for name in components.components if name not in SIMULATIONS])
+    print(f"AETHER components ready in {components.startup_ms}ms")
+    # Simulations run only on the cluster leader (always this worker with the local backend)
+    await cluster.start(start_simulations, stop_simulations, aether_blockchain, alert_store.max_alerts)
+    ingestion_queue.start()
+    yield
+    # Seal whatever is still in the pending pool before the components go away
+    await ingestion_queue.stop()
+    await cluster.stop(stop_simulations)
+    await components.stop_all()
+    await load_shedder.stop()
+    metrics_sampler.stop()
+    snapshot_assembler.shutdown()
+    await blocking_detector.stop()
+
+app = FastAPI(
+    title="AETHER: AI-Powered Satellite-Integrated Intelligent Mobility System",
+    default_response_class=NegotiatedResponse,
+    lifespan=lifespan
+)
 
-app = FastAPI(title="AETHER: AI-Powered Satellite-Integrated Intelligent Mobility System")
+@app.middleware("http")
+async def negotiate_content_type(request: Request, call_next):
+    """Serve JSON, MessagePack or CBOR bodies depending on the Accept header"""
+    response_encoding.set(negotiate(request.headers.get('accept')))
+    response = await call_next(request)
+    response.headers.append('Vary', 'Accept')
+    return response
 
+@app.middleware("http")
+async def cache_get_responses(request: Request, call_next):
+    """Serve cached GET bodies with a strong ETag; If-None-Match hits get a 304
+    without running the handler"""
+    policy = response_cache.policy_for(request.url.path) if request.method == 'GET' else None
+    if policy is None:
+        return await call_next(request)
+    request.scope['cache_route'] = policy.path
+
+    key = (request.url.path, request.url.query, negotiate(request.headers.get('accept')))
+    entry = response_cache.get(key)
+    cache_status = 'HIT'
+    if entry is None:
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+        body = b''.join([chunk async for chunk in response.body_iterator])
+        headers = {name: value for name, value in response.headers.items()
+                   if name not in ('content-length', 'etag')}
+        entry = response_cache.put(key, body, response.status_code, headers, policy)
+        cache_status = 'MISS'
+
+    cache_headers = {
+        'ETag': entry.etag,
+        'Cache-Control': f"max-age={int(policy.ttl)}",
+        'X-Cache': cache_status
+    }
+    if etag_matches(request.headers.get('if-none-match'), entry.etag):
+        response_cache.not_modified += 1
+        return Response(status_code=304, headers=cache_headers)
+    return Response(entry.body, status_code=entry.status_code, headers={**entry.headers, **cache_headers})
+
+# Compresses the final (cached or negotiated) body; timed by the Prometheus middleware
+app.add_middleware(CompressionMiddleware, **COMPRESSION_SETTINGS)
+
+app.add_middleware(PrometheusMiddleware)
+
+# Added last so it wraps the negotiated and cached responses above
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -43,7 +142,6 @@ class AETHERCore:
         self.ai_predictions = {}
         self.environmental_data = {}
         self.fleet_data = {}
-        self.emergency_alerts = []
         self.driver_analysis = {}
         self.navigation_data = {}
         self.last_update = datetime.now(timezone.utc)
@@ -77,7 +175,7 @@ class AETHERCore:
     
     async def get_ai_predictions(self):
         # Get real system metrics for AI analysis
-        real_metrics = get_real_time_metrics()
+        real_metrics = get_ai_metrics()
         
         # Advanced collision prediction
         collision_data = ai_predictor.predict_collision_risk(real_metrics)
@@ -240,14 +338,18 @@ class AETHERCore:
         }
     
     def get_blockchain_status(self):
+        cluster.sync_blocks(aether_blockchain)
+        chain_valid = aether_blockchain.is_chain_valid()
         return {
             'blockchain_active': True,
             'total_blocks': len(aether_blockchain.chain),
-            'chain_integrity': aether_blockchain.is_chain_valid(),
+            'chain_integrity': chain_valid,
+            'verified_height': aether_blockchain.verified_height,
+            'last_audit': aether_blockchain.last_audit,
             'last_block_time': aether_blockchain.get_latest_block().timestamp,
             'security_level': 'MILITARY_GRADE',
             'data_tamper_proof': True,
-            'verification_score': 100.0 if aether_blockchain.is_chain_valid() else 0.0
+            'verification_score': 100.0 if chain_valid else 0.0
         }
     
     def get_quantum_status(self):
@@ -333,107 +435,378 @@ def detect_device_info():
         }
 
 def get_real_time_metrics():
-    try:
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('C:\\' if platform.system() == 'Windows' else '/')
-        network = psutil.net_io_counters()
-        
-        return {
-            'cpu_usage': cpu_percent,
-            'memory_usage': memory.percent,
-            'disk_usage': disk.percent,
-            'network_sent': network.bytes_sent,
-            'network_recv': network.bytes_recv,
-            'processes': len(psutil.pids()),
-            'boot_time': psutil.boot_time()
-        }
-    except Exception:
-        return {
-            'cpu_usage': 0,
-            'memory_usage': 0,
-            'disk_usage': 0,
-            'network_sent': 0,
-            'network_recv': 0,
-            'processes': 0,
-            'boot_time': 0,
-            'error': 'Metrics unavailable'
-        }
+    """Latest sample from the background sampler; never blocks the event loop"""
+    return dict(metrics_sampler.get_latest())
+
+def get_ai_metrics():
+    """Real-time metrics plus rate-derived values and a short history for the AI models"""
+    metrics = get_real_time_metrics()
+    metrics['network_activity'] = metrics.get('network_sent_rate', 0) + metrics.get('network_recv_rate', 0)
+    metrics['history'] = [
+        {'cpu_usage': sample['cpu_usage'], 'memory_usage': sample['memory_usage']}
+        for sample in metrics_sampler.get_history(30)
+    ]
+    return metrics
 
 aether_core = AETHERCore()
 
 # Connection Manager for WebSocket
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    def __init__(self, snapshot_interval: float = 1.5, keyframe_interval: int = 20,
+                 min_topic_interval: float = 0.1, max_queue: int = 32,
+                 send_timeout: float = 5.0, evict_after: float = 10.0):
+        self.sessions: Dict[WebSocket, ClientSession] = {}
+        self.snapshot_interval = snapshot_interval
+        self.keyframe_interval = keyframe_interval
+        self.producer_task: Optional[asyncio.Task] = None
+        # Keyed by canonical field spec (None = the whole snapshot)
+        self.latest_snapshots: Dict[Optional[str], EncodedFrame] = {}
+        self.delta_streams: Dict[Optional[str], DeltaStream] = {}
+        self.min_topic_interval = min_topic_interval
+        self.topic_tasks: Dict[str, asyncio.Task] = {}
+        self.topic_wakeups: Dict[str, asyncio.Event] = {}
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.evict_after = evict_after
+        self.evictions = 0
 
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
+    async def connect(self, websocket: WebSocket, protocol: str = 'full', encoding: Optional[str] = None,
+                      deflate: bool = False, fields: Optional[FieldTree] = None):
+        subprotocol = subprotocol_for(encoding) if encoding else None
+        if subprotocol and deflate:
+            subprotocol += DEFLATE_SUFFIX
+        await websocket.accept(subprotocol=subprotocol)
+        session = ClientSession(websocket, protocol, encoding or 'json',
+                                max_queue=self.max_queue, send_timeout=self.send_timeout,
+                                compressor=FrameCompressor(WS_DEFLATE_LEVEL) if deflate else None,
+                                fields=fields)
+        self.sessions[websocket] = session
+        session.sender_task = asyncio.create_task(self._run_sender(session))
+        if session.fields_key in self.latest_snapshots:
+            # Give new subscribers the last frame instead of waiting a full tick
+            session.offer_snapshot(self.encode_snapshot_for(session))
+        self.ensure_producer()
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        session = self.sessions.pop(websocket, None)
+        if session and session.sender_task and session.sender_task is not asyncio.current_task():
+            session.sender_task.cancel()
+
+    async def _run_sender(self, session: ClientSession):
+        try:
+            await session.run_sender()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.evict(session, f"send failed: {str(e)[:100] or type(e).__name__}")
+
+    def evict(self, session: ClientSession, reason: str):
+        """Drop a client that cannot keep up; it may reconnect and start from a fresh frame"""
+        if session.websocket not in self.sessions:
+            return
+        self.evictions += 1
+        print(f"Evicting WebSocket client {session.get_stats()['client']}: {reason}")
+        self.disconnect(session.websocket)
+        asyncio.create_task(self._close_quietly(session.websocket))
+
+    async def _close_quietly(self, websocket: WebSocket):
+        try:
+            await websocket.close(code=1013)
+        except Exception:
+            pass
+
+    def enforce_send_budgets(self):
+        for session in list(self.sessions.values()):
+            if session.over_budget_for() > self.evict_after:
+                self.evict(session, f"over send budget for more than {self.evict_after:g}s")
+
+    def get_stats(self) -> Dict[str, Any]:
+        connections = [session.get_stats() for session in self.sessions.values()]
+        return {
+            'active_connections': len(connections),
+            'evictions': self.evictions,
+            'total_queue_depth': sum(stats['queue_depth'] for stats in connections),
+            'total_dropped': sum(stats['dropped'] for stats in connections),
+            'connections': connections
+        }
+
+    async def handle_client_message(self, websocket: WebSocket, message: Union[str, bytes]):
+        session = self.sessions.get(websocket)
+        if session is None:
+            return
+        try:
+            payload = decode(message, 'json' if isinstance(message, str) else session.encoding)
+        except Exception:
+            return
+        if not isinstance(payload, dict):
+            return
+
+        if payload.get('type') == 'ack' and isinstance(payload.get('seq'), int):
+            if (session.acked_seq is None or payload['seq'] > session.acked_seq
+                    or payload['seq'] == session.keyframe_seq):
+                session.acked_seq = payload['seq']
+        elif payload.get('type') == 'alert_ack' and isinstance(payload.get('triggered_at'), (int, float)):
+            ALERT_DELIVERY.observe(max(0.0, time.time() - payload['triggered_at']), stage='acked')
+        elif payload.get('type') == 'keyframe_request':
+            session.keyframe_requested = True
+        elif payload.get('type') == 'subscribe' and isinstance(payload.get('topics'), dict):
+            session.enqueue(encode_frame(self.subscribe(session, payload['topics']), session.encoding))
+        elif payload.get('type') == 'unsubscribe' and isinstance(payload.get('topics'), list):
+            self.unsubscribe(session, payload['topics'])
+            session.enqueue(encode_frame({'type': 'subscribed', 'topics': session.topics, 'rejected': []},
+                                         session.encoding))
+
+    def subscribe(self, session: ClientSession, topics: Dict[str, Any]) -> Dict[str, Any]:
+        """Subscribe a session to aether_data topics, each with its own interval in seconds"""
+        rejected = []
+        for topic, interval in topics.items():
+            if topic not in AETHER_DATA_SOURCES or isinstance(interval, bool) or not isinstance(interval, (int, float)):
+                rejected.append(topic)
+                continue
+            session.topics[topic] = max(self.min_topic_interval, float(interval))
+            session.topic_due[topic] = 0.0
+            self.ensure_topic_producer(topic)
+        return {'type': 'subscribed', 'topics': session.topics, 'rejected': rejected}
+
+    def unsubscribe(self, session: ClientSession, topics: List[str]):
+        for topic in topics:
+            session.topics.pop(topic, None)
+            session.topic_due.pop(topic, None)
+        if not session.topics:
+            self.ensure_producer()
+
+    def snapshot_sessions(self) -> List[ClientSession]:
+        return [session for session in self.sessions.values() if not session.topics]
+
+    def topic_subscribers(self, topic: str) -> List[ClientSession]:
+        return [session for session in self.sessions.values() if topic in session.topics]
 
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
+    def ensure_topic_producer(self, topic: str):
+        task = self.topic_tasks.get(topic)
+        if task is None or task.done():
+            self.topic_wakeups[topic] = asyncio.Event()
+            self.topic_tasks[topic] = asyncio.create_task(self._produce_topic(topic))
+        else:
+            # Wake the producer so a new (possibly faster) subscriber is served right away
+            self.topic_wakeups[topic].set()
+
+    async def _produce_topic(self, topic: str):
+        """Compute one topic at the fastest rate any subscriber asked for.
+
+        Each subscriber only receives a frame once its own interval has elapsed.
+        The task exits when the topic has no subscribers left.
+        """
+        wakeup = self.topic_wakeups[topic]
+        while True:
+            subscribers = self.topic_subscribers(topic)
+            if not subscribers:
+                break
+            tick_interval = load_shedder.stretch(min(session.topics[topic] for session in subscribers))
+            started = time.monotonic()
             try:
-                await connection.send_text(json.dumps(message))
-            except Exception:
+                # Low-priority topics are skipped under load; subscribers resume once the loop recovers
+                if load_shedder.allows(topic):
+                    await self._publish_topic(topic, subscribers, started, tick_interval)
+                    self.enforce_send_budgets()
+            except Exception as e:
+                print(f"Topic producer error ({topic}): {e}")
+            elapsed = time.monotonic() - started
+            try:
+                await asyncio.wait_for(wakeup.wait(), max(0.0, tick_interval - elapsed))
+            except asyncio.TimeoutError:
                 pass
+            wakeup.clear()
+        self.topic_tasks.pop(topic, None)
+        self.topic_wakeups.pop(topic, None)
+
+    async def _publish_topic(self, topic: str, subscribers: List[ClientSession], started: float,
+                             tick_interval: float):
+        with WS_FRAME_BUILD.time(stream='topic'):
+            result = await snapshot_assembler.assemble([topic])
+            frame = EncodedFrame({
+                'type': 'topic',
+                'topic': topic,
+                'timestamp': datetime.now().isoformat(),
+                'data': result['sections'].get(topic),
+                'status': result['section_status'][topic]
+            })
+        for session in subscribers:
+            # Half a tick of tolerance keeps jitter from skipping a whole tick
+            if topic in session.topics and started + tick_interval / 2 >= session.topic_due[topic]:
+                session.topic_due[topic] = started + session.topics[topic]
+                session.offer_topic(topic, frame.get(session.encoding))
+
+    def encode_snapshot_for(self, session: ClientSession) -> Union[str, bytes]:
+        """Full frame, keyframe or delta against the client's last acknowledged state;
+        the keyframe also goes out whenever the delta would not be smaller"""
+        if session.protocol != 'delta':
+            return self.latest_snapshots[session.fields_key].get(session.encoding)
+
+        delta_stream = self.delta_streams[session.fields_key]
+        needs_keyframe = (
+            session.keyframe_requested
+            or session.pending_keyframe
+            or not delta_stream.has_frame(session.acked_seq)
+            or session.frames_since_keyframe >= self.keyframe_interval
+        )
+        if needs_keyframe:
+            session.keyframe_requested = False
+            session.pending_keyframe = True
+            session.frames_since_keyframe = 0
+            session.keyframe_seq = delta_stream.seq
+            return delta_stream.encode_keyframe(session.encoding)
+        delta = delta_stream.encode_delta(session.acked_seq, session.encoding)
+        keyframe = delta_stream.encode_keyframe(session.encoding)
+        if len(delta) >= len(keyframe):
+            session.frames_since_keyframe = 0
+            session.keyframe_seq = delta_stream.seq
+            return keyframe
+        session.frames_since_keyframe += 1
+        return delta
+
+    def ensure_producer(self):
+        """Start the shared snapshot producer if it is not already running"""
+        if self.producer_task is None or self.producer_task.done():
+            self.producer_task = asyncio.create_task(self._produce_snapshots())
+
+    async def _produce_snapshots(self):
+        """Build one snapshot per tick and publish it to every subscriber.
+
+        Runs only while at least one client is on the snapshot stream (no topic
+        subscriptions), so the per-tick cost stays flat regardless of the
+        number of clients. Only the sections some client's `fields` selects
+        are computed; each distinct projection is encoded once per tick.
+        """
+        while self.snapshot_sessions():
+            started = time.monotonic()
+            try:
+                with WS_FRAME_BUILD.time(stream='snapshot'):
+                    projections = {session.fields_key: session.fields for session in self.snapshot_sessions()}
+                    needed = merge_fields(projections.values())
+                    # Shares the computation with concurrent /api/dynamic/full-system requests
+                    data = await request_coalescer.do('full-system', format_fields(needed),
+                                                      get_comprehensive_system_data, needed)
+                    for key in set(self.latest_snapshots) - set(projections):
+                        del self.latest_snapshots[key]
+                        del self.delta_streams[key]
+                    for key, fields in projections.items():
+                        projected = project(data, fields)
+                        self.delta_streams.setdefault(key, DeltaStream()).publish(projected)
+                        self.latest_snapshots[key] = EncodedFrame(projected)
+                    for session in self.snapshot_sessions():
+                        # Clients that joined with a new projection mid-tick get the next one
+                        if session.fields_key in projections:
+                            session.offer_snapshot(self.encode_snapshot_for(session))
+                self.enforce_send_budgets()
+            except Exception as e:
+                print(f"Snapshot producer error: {e}")
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(0.0, load_shedder.stretch(self.snapshot_interval) - elapsed))
+        self.producer_task = None
+        self.latest_snapshots.clear()
+        self.delta_streams.clear()
+
+    def broadcast_alert(self, alert: Dict[str, Any]):
+        """Push an alert on every connection's priority lane, ahead of queued snapshots.
+        A client whose lane is full is evicted rather than silently missing the alert."""
+        frame = EncodedFrame({'type': 'EMERGENCY_ALERT', 'priority': 'high', 'data': alert,
+                              'triggered_at': alert['triggered_at'], 'pushed_at': time.time()})
+        for session in list(self.sessions.values()):
+            if not session.enqueue_priority(frame.get(session.encoding), alert['triggered_at']):
+                self.evict(session, 'emergency alert lane full')
 
 manager = ConnectionManager()
 
-async def get_comprehensive_system_data():
-    """Get all AETHER system data including vehicle, drone, AI predictions, and environmental data"""
-    try:
-        device_info = device_manager.get_system_summary()
-        real_time_metrics = get_real_time_metrics()
-        
-        # Get enhanced vehicle health with AI analysis
-        vehicle_health = aether_core.get_vehicle_health()
-        health_analysis = ai_predictor.analyze_vehicle_health(real_time_metrics)
-        
-        # Get IoT sensor data
-        iot_data = iot_manager.get_all_sensor_data()
-        
-        # Get swarm intelligence data
-        swarm_data = swarm_intelligence.get_swarm_status()
-        
-        aether_data = {
-            'vehicle_health': {**vehicle_health, 'ai_analysis': health_analysis},
-            'ai_predictions': await aether_core.get_ai_predictions(),
-            'environmental_data': await aether_core.get_environmental_data(),
-            'drone_status': aether_core.get_drone_status(),
-            'navigation': aether_core.get_navigation_data(),
-            'emergency_alerts': aether_core.get_emergency_status(),
-            'fleet_management': aether_core.get_fleet_management(),
-            'blockchain_security': aether_core.get_blockchain_status(),
-            'quantum_encryption': aether_core.get_quantum_status(),
-            'iot_sensors': iot_data,
-            'swarm_intelligence': swarm_data,
-            'device_information': device_manager.get_device_info()
-        }
-        
-        return {
-            'timestamp': datetime.now().isoformat(),
-            'dynamic_system': {
-                'device_type': device_info.get('device_type', 'laptop'),
-                'device_info': device_info,
-                'real_time_metrics': real_time_metrics
-            },
-            'aether_data': aether_data
-        }
-    except Exception as e:
-        print(f"Error getting system data: {e}")
-        return {
-            'timestamp': datetime.now().isoformat(),
-            'dynamic_system': {
-                'device_type': device_manager.get_system_summary().get('device_type', 'Unknown'),
-                'device_info': device_manager.get_system_summary(),
-                'real_time_metrics': get_real_time_metrics()
-            },
-            'aether_data': {}
-        }
+def get_enhanced_vehicle_health():
+    """Vehicle health combined with the AI health analysis"""
+    vehicle_health = aether_core.get_vehicle_health()
+    health_analysis = ai_predictor.analyze_vehicle_health(get_real_time_metrics())
+    return {**vehicle_health, 'ai_analysis': health_analysis}
+
+# Snapshot sections: name -> (source, deadline in seconds)
+AETHER_DATA_SOURCES = {
+    'vehicle_health': (get_enhanced_vehicle_health, 1.0),
+    'ai_predictions': (aether_core.get_ai_predictions, 1.5),
+    'environmental_data': (aether_core.get_environmental_data, 1.5),
+    'drone_status': (aether_core.get_drone_status, 0.5),
+    'navigation': (aether_core.get_navigation_data, 0.5),
+    'emergency_alerts': (aether_core.get_emergency_status, 0.5),
+    'fleet_management': (aether_core.get_fleet_management, 0.5),
+    'blockchain_security': (aether_core.get_blockchain_status, 2.0),
+    'quantum_encryption': (aether_core.get_quantum_status, 0.5),
+    'iot_sensors': (lambda: cluster.read('iot_sensors'), 1.0),
+    'swarm_intelligence': (lambda: cluster.read('swarm_status'), 1.0),
+    'device_information': (lambda: device_manager.get_device_info(), 0.5)
+}
+
+for section_name, (source, deadline) in AETHER_DATA_SOURCES.items():
+    snapshot_assembler.register(section_name, source, deadline)
+snapshot_assembler.register('device_summary', lambda: device_manager.get_system_summary(), 1.0)
+
+# Shape of the full-system snapshot for `fields` validation (None = free-form below this point)
+SNAPSHOT_SCHEMA = {
+    'timestamp': None,
+    'dynamic_system': {'device_type': None, 'device_info': None, 'real_time_metrics': None},
+    'aether_data': {name: None for name in AETHER_DATA_SOURCES},
+    'section_status': None
+}
+
+def snapshot_sections(fields: Optional[FieldTree]) -> Optional[List[str]]:
+    """Assembler sources needed to answer `fields` (None = all of them)"""
+    if fields is None:
+        return None
+    sections = [name for name in AETHER_DATA_SOURCES if selects(fields, f'aether_data.{name}')]
+    if selects(fields, 'dynamic_system.device_type') or selects(fields, 'dynamic_system.device_info'):
+        sections.append('device_summary')
+    return sections
+
+async def get_comprehensive_system_data(fields: Optional[FieldTree] = None):
+    """Get all AETHER system data including vehicle, drone, AI predictions, and environmental data.
+
+    Sections are gathered concurrently; a failing or slow subsystem is left
+    out and reported in `section_status` instead of discarding the frame, as
+    are low-priority sections while the load shedder is dropping them.
+    With `fields`, only the sources behind the selected paths run and the
+    result is pruned to those paths.
+    """
+    selected = snapshot_sections(fields)
+    if selected is None:
+        selected = list(snapshot_assembler.sources)
+    shed = [name for name in selected if not load_shedder.allows(name)]
+    result = await snapshot_assembler.assemble([name for name in selected if name not in shed])
+    result['section_status'].update({name: {'status': 'shed', 'latency_ms': 0.0} for name in shed})
+    sections = result['sections']
+    device_info = sections.get('device_summary', {})
+    aether_data = {name: sections[name] for name in AETHER_DATA_SOURCES if name in sections}
+    wants_metrics = selects(fields, 'dynamic_system.real_time_metrics')
+
+    return project({
+        'timestamp': datetime.now().isoformat(),
+        'dynamic_system': {
+            'device_type': device_info.get('device_type', 'laptop'),
+            'device_info': device_info,
+            'real_time_metrics': get_real_time_metrics() if wants_metrics else {}
+        },
+        'aether_data': aether_data,
+        'section_status': result['section_status']
+    }, fields)
+
+# Cached GET routes: path (trailing '/' = prefix) -> (TTL in seconds, invalidation tags)
+RESPONSE_CACHE_POLICIES = {
+    '/api/dynamic/device-info': (10.0, ['device']),
+    '/api/aether/device-info': (30.0, ['device']),
+    '/api/aether/device-summary': (10.0, ['device']),
+    '/api/aether/blockchain': (2.0, ['blockchain']),
+    '/api/aether/vehicle-history/': (2.0, ['blockchain']),
+    '/api/aether/emergency': (1.0, ['emergency']),
+    '/api/aether/fleet': (1.5, ['fleet']),
+    '/api/aether/quantum': (5.0, ['quantum']),
+    '/api/aether/iot-sensors': (0.5, ['iot']),
+    '/api/aether/swarm-status': (1.0, ['swarm'])
+}
+
+for cached_path, (ttl, tags) in RESPONSE_CACHE_POLICIES.items():
+    response_cache.configure(cached_path, ttl, tags)
 
 @app.get("/")
 async def root():
@@ -484,8 +857,15 @@ async def get_metrics():
     return get_real_time_metrics()
 
 @app.get("/api/dynamic/full-system")
-async def get_full_system():
-    return get_comprehensive_system_data()
+async def get_full_system(fields: Optional[str] = None):
+    """`fields` takes comma-separated dotted paths (e.g. `aether_data.vehicle_health,timestamp`);
+    only the subsystems behind them are computed"""
+    projection = parse_fields(fields)
+    unknown = unknown_fields(projection, SNAPSHOT_SCHEMA)
+    if unknown:
+        return NegotiatedResponse({'error': f"Unknown fields: {', '.join(unknown)}"}, status_code=400)
+    return await request_coalescer.do('full-system', format_fields(projection),
+                                      get_comprehensive_system_data, projection)
 
 @app.get("/api/aether/vehicle-health")
 async def get_vehicle_health():
@@ -493,7 +873,7 @@ async def get_vehicle_health():
 
 @app.get("/api/aether/ai-predictions")
 async def get_ai_predictions():
-    return await aether_core.get_ai_predictions()
+    return await request_coalescer.do('ai-predictions', None, aether_core.get_ai_predictions)
 
 @app.get("/api/aether/environmental")
 async def get_environmental():
@@ -517,48 +897,218 @@ async def get_fleet_management():
 
 @app.get("/api/aether/blockchain")
 async def get_blockchain_status():
-    return aether_core.get_blockchain_status()
+    # Syncs cluster blocks and verifies the chain, both blocking
+    return await asyncio.to_thread(aether_core.get_blockchain_status)
 
 @app.get("/api/aether/quantum")
 async def get_quantum_status():
     return aether_core.get_quantum_status()
 
+INGEST_SUBMIT_CHUNK = 1000
+
+def parse_vehicle_record(record: Any) -> Optional[tuple]:
+    """(vehicle_id, data) for an ingested record, None if it is not an object or its
+    vehicle_id is not a string or number (numbers are indexed by their string form)"""
+    if not isinstance(record, dict):
+        return None
+    vehicle_id = record.get('vehicle_id', 'AETHER_VEHICLE_001')
+    if isinstance(vehicle_id, bool) or not isinstance(vehicle_id, (str, int, float)):
+        return None
+    return str(vehicle_id), record
+
+async def ingest_receipt(first_seq: Optional[int], last_seq: Optional[int], accepted: int,
+                         rejected: int, wait: float) -> Dict[str, Any]:
+    receipt = {'accepted': accepted, 'rejected': rejected, 'first_seq': first_seq, 'last_seq': last_seq}
+    if last_seq is not None:
+        receipt['status_url'] = f"/api/aether/ingest/status/{last_seq}"
+        if wait > 0:
+            receipt['commit'] = await ingestion_queue.wait(last_seq, min(wait, 30.0))
+    return receipt
+
+def ingest_rejected(e: Exception, receipt: Dict[str, Any]) -> Response:
+    return NegotiatedResponse({'error': f"Ingestion queue full: {str(e)[:100]}", **receipt},
+                              status_code=503, headers={'Retry-After': '1'})
+
 @app.post("/api/aether/store-vehicle-data")
-async def store_vehicle_data(data: dict):
-    vehicle_id = data.get('vehicle_id', 'AETHER_VEHICLE_001')
-    success = aether_blockchain.add_vehicle_data(vehicle_id, data)
-    return {'success': success, 'blockchain_height': len(aether_blockchain.chain)}
+async def store_vehicle_data(data: dict, wait: float = 0):
+    """Add one record to the pending pool. The receipt's `seq` resolves to a block
+    once the producer seals it; `wait` blocks up to that many seconds for the seal."""
+    record = parse_vehicle_record(data)
+    if record is None:
+        return NegotiatedResponse({'success': False, 'error': 'vehicle_id must be a string or number',
+                                   'accepted': 0, 'rejected': 1}, status_code=400)
+    try:
+        first_seq, last_seq = ingestion_queue.submit([record])
+    except IngestionQueueFull as e:
+        return ingest_rejected(e, {'success': False, 'accepted': 0, 'rejected': 1})
+    receipt = await ingest_receipt(first_seq, last_seq, 1, 0, wait)
+    return {'success': receipt.get('commit', {}).get('status') != 'failed', 'seq': last_seq, **receipt,
+            'blockchain_height': len(aether_blockchain.chain)}
+
+@app.post("/api/aether/ingest/batch")
+async def ingest_batch(request: Request, wait: float = 0):
+    """Queue many vehicle records (a JSON array, or {"records": [...]}) for group commit.
+    Returns at once with the records' sequence numbers unless `wait` seconds are given."""
+    try:
+        body = decode(await request.body())
+    except Exception as e:
+        return NegotiatedResponse({'error': f"Invalid JSON: {str(e)[:100]}"}, status_code=400)
+    records = body.get('records') if isinstance(body, dict) else body
+    if not isinstance(records, list):
+        return NegotiatedResponse({'error': 'Expected a JSON array of records'}, status_code=400)
+
+    parsed = [parse_vehicle_record(record) for record in records]
+    valid = [record for record in parsed if record is not None]
+    try:
+        first_seq, last_seq = ingestion_queue.submit(valid) if valid else (None, None)
+    except IngestionQueueFull as e:
+        return ingest_rejected(e, {'accepted': 0, 'rejected': len(records)})
+    return await ingest_receipt(first_seq, last_seq, len(valid), len(records) - len(valid), wait)
+
+@app.post("/api/aether/ingest/stream")
+async def ingest_stream(request: Request, wait: float = 0):
+    """Queue newline-delimited JSON records as they arrive, without buffering the whole upload"""
+    buffer = b''
+    chunk: List[tuple] = []
+    first_seq = last_seq = None
+    accepted = rejected = 0
+
+    def take(line: bytes):
+        nonlocal rejected
+        if not line.strip():
+            return
+        try:
+            record = parse_vehicle_record(decode(line))
+        except Exception:
+            record = None
+        if record is None:
+            rejected += 1
+        else:
+            chunk.append(record)
+
+    def flush():
+        nonlocal first_seq, last_seq, accepted
+        if chunk:
+            first, last_seq = ingestion_queue.submit(chunk)
+            first_seq = first_seq or first
+            accepted += len(chunk)
+            chunk.clear()
+
+    try:
+        async for data in request.stream():
+            lines = (buffer + data).split(b'\n')
+            buffer = lines.pop()
+            for line in lines:
+                take(line)
+            if len(chunk) >= INGEST_SUBMIT_CHUNK:
+                flush()
+        take(buffer)
+        flush()
+    except IngestionQueueFull as e:
+        return ingest_rejected(e, {'accepted': accepted, 'rejected': rejected,
+                                   'first_seq': first_seq, 'last_seq': last_seq})
+    return await ingest_receipt(first_seq, last_seq, accepted, rejected, wait)
+
+@app.get("/api/aether/ingest/status/{seq}")
+async def get_ingest_status(seq: int, wait: float = 0):
+    """Commit status of an ingested record; `wait` blocks up to that many seconds for the commit"""
+    if wait > 0:
+        return await ingestion_queue.wait(seq, min(wait, 30.0))
+    return ingestion_queue.status(seq)
+
+@app.get("/api/aether/ingest/stats")
+async def get_ingest_stats():
+    return ingestion_queue.get_stats()
+
+def ledger_unreadable(e: OSError) -> Response:
+    """A block could not be read back from the on-disk ledger (corrupt or missing segment)"""
+    print(f"Ledger read error: {e}")
+    return NegotiatedResponse({'error': f"Ledger record unreadable: {str(e)[:100]}"}, status_code=500)
 
 @app.get("/api/aether/vehicle-history/{vehicle_id}")
-async def get_vehicle_history(vehicle_id: str):
-    history = aether_blockchain.get_vehicle_history(vehicle_id)
-    integrity = aether_blockchain.verify_data_integrity(vehicle_id)
-    return {'history': history, 'integrity': integrity}
+async def get_vehicle_history(vehicle_id: str, since: Optional[str] = None, until: Optional[str] = None,
+                              cursor: Optional[int] = None, limit: int = 100):
+    """A vehicle's ledger records, newest first. `since`/`until` take ISO times or epoch
+    seconds; pass the returned `next_cursor` as `cursor` for the next page."""
+    try:
+        since_ts, until_ts = alert_store.parse_time(since), alert_store.parse_time(until)
+    except ValueError as e:
+        return NegotiatedResponse({'error': f"Invalid time filter: {str(e)[:100]}"}, status_code=400)
+    await asyncio.to_thread(cluster.sync_blocks, aether_blockchain)
+    try:
+        page = aether_blockchain.query_vehicle_history(vehicle_id, since_ts, until_ts, cursor, limit)
+        integrity = aether_blockchain.verify_data_integrity(vehicle_id)
+    except OSError as e:
+        return ledger_unreadable(e)
+    return {'history': page['records'], 'next_cursor': page['next_cursor'], 'count': page['count'],
+            'integrity': integrity, 'index_ready': page['index_ready']}
+
+@app.get("/api/aether/blockchain/verification")
+async def get_blockchain_verification():
+    """Verified-height watermark and the last full audit"""
+    return aether_blockchain.get_verification_status()
+
+@app.get("/api/aether/blockchain/proof")
+async def get_inclusion_proof(seq: Optional[int] = None, block_index: Optional[int] = None,
+                              position: Optional[int] = None):
+    """Merkle inclusion proof for one record, by ingestion receipt `seq` or by
+    `block_index` and `position`. Verify it offline with backend/merkle.py."""
+    if seq is not None:
+        status = ingestion_queue.status(seq)
+        if status['status'] == 'indexing':
+            return NegotiatedResponse({'error': "Ledger index is still being rebuilt", **status},
+                                      status_code=503, headers={'Retry-After': '1'})
+        if status['status'] != 'committed':
+            return NegotiatedResponse({'error': f"Record {seq} is {status['status']}", **status}, status_code=404)
+        block_index, position = status['block_index'], status['position']
+    if block_index is None or position is None:
+        return NegotiatedResponse({'error': 'Pass seq, or block_index and position'}, status_code=400)
+    await asyncio.to_thread(cluster.sync_blocks, aether_blockchain)
+    try:
+        proof = await asyncio.to_thread(aether_blockchain.get_inclusion_proof, block_index, position)
+    except OSError as e:
+        return ledger_unreadable(e)
+    if proof is None:
+        return NegotiatedResponse({'error': f"No Merkle-rooted record at block {block_index}, position {position}"},
+                                  status_code=404)
+    return proof
+
+@app.post("/api/aether/blockchain/audit")
+async def run_blockchain_audit():
+    """Rehash the chain from genesis now instead of waiting for the scheduled audit"""
+    await asyncio.to_thread(aether_blockchain.audit)
+    response_cache.invalidate('blockchain')
+    return aether_blockchain.get_verification_status()
 
 @app.get("/api/aether/iot-sensors")
 async def get_iot_sensors():
-    return iot_manager.get_all_sensor_data()
+    return cluster.read('iot_sensors')
 
 @app.get("/api/aether/swarm-status")
 async def get_swarm_status():
-    return swarm_intelligence.get_swarm_status()
+    return cluster.read('swarm_status')
 
 @app.get("/api/aether/swarm-vehicles")
 async def get_swarm_vehicles():
-    return swarm_intelligence.get_all_vehicles_data()
+    return cluster.read('swarm_vehicles')
 
 @app.get("/api/aether/vehicle/{vehicle_id}")
 async def get_vehicle_data(vehicle_id: str):
-    return swarm_intelligence.get_vehicle_data(vehicle_id)
+    if cluster.is_leader:
+        return swarm_intelligence.get_vehicle_data(vehicle_id)
+    return next((vehicle for vehicle in cluster.read('swarm_vehicles')
+                 if vehicle.get('vehicle_id') == vehicle_id), None)
 
 @app.post("/api/aether/start-iot-monitoring")
 async def start_iot_monitoring():
     iot_manager.start_monitoring()
+    response_cache.invalidate('iot')
     return {'status': 'IoT monitoring started', 'sensors': list(iot_manager.sensors.keys())}
 
 @app.post("/api/aether/stop-iot-monitoring")
 async def stop_iot_monitoring():
     iot_manager.stop_monitoring()
+    response_cache.invalidate('iot')
     return {'status': 'IoT monitoring stopped'}
 
 @app.get("/api/aether/device-info")
@@ -571,39 +1121,175 @@ async def get_device_summary():
 
 @app.post("/api/aether/refresh-device-info")
 async def refresh_device_info():
-    return device_manager.refresh_device_info()
+    device_info = device_manager.refresh_device_info()
+    response_cache.invalidate('device')
+    return device_info
 
 @app.post("/api/aether/emergency-alert")
 async def trigger_emergency_alert(alert_data: dict):
+    """Push the alert to every client first; recording it durably happens afterwards"""
+    triggered_at = time.time()
     alert = {
+        'alert_id': f"ALERT_{int(triggered_at * 1000)}",
         'type': alert_data.get('type', 'MANUAL_ALERT'),
         'severity': alert_data.get('severity', 'HIGH'),
         'message': alert_data.get('message', 'Manual emergency alert triggered'),
         'timestamp': datetime.now().isoformat(),
         'location': alert_data.get('location', {'lat': 28.6139, 'lon': 77.2090}),
-        'auto_response': 'Emergency services contacted'
+        'auto_response': 'Emergency services contacted',
+        'vehicle_id': str(alert_data.get('vehicle_id', 'AETHER_VEHICLE_001')),
+        'triggered_at': triggered_at
     }
-    aether_core.emergency_alerts.append(alert)
+    manager.broadcast_alert(alert)
+    seq = await cluster.record_alert(alert)
+    response_cache.invalidate('emergency')
     
-    # Store alert in blockchain for tamper-proof record
-    vehicle_id = alert_data.get('vehicle_id', 'AETHER_VEHICLE_001')
-    aether_blockchain.add_vehicle_data(vehicle_id, alert)
-    
-    await manager.broadcast({'type': 'EMERGENCY_ALERT', 'data': alert})
-    return {'status': 'Alert triggered', 'alert_id': f"ALERT_{int(datetime.now().timestamp())}"}
+    # Store alert in blockchain for tamper-proof record; the block producer seals it off the alert path
+    try:
+        ingestion_queue.submit([(alert['vehicle_id'], alert)])
+    except IngestionQueueFull as e:
+        print(f"Alert recording error: {e}")
+    return {'status': 'Alert triggered', 'alert_id': alert['alert_id'], 'seq': seq}
+
+# State the cluster leader computes and publishes for the other workers
+cluster.publish('iot_sensors', lambda: iot_manager.get_all_sensor_data())
+cluster.publish('swarm_status', lambda: swarm_intelligence.get_swarm_status())
+cluster.publish('swarm_vehicles', lambda: swarm_intelligence.get_all_vehicles_data())
+
+async def on_cluster_change(kind: str, payload: Any):
+    """Index every alert; for other workers' writes also refresh caches and fan alerts out"""
+    if kind == 'alert':
+        alert_store.add(payload['seq'], payload['alert'])
+        if not payload['local'] and not payload['replayed']:
+            response_cache.invalidate('emergency')
+            if 'triggered_at' in payload['alert']:
+                manager.broadcast_alert(payload['alert'])
+    elif kind == 'blocks':
+        response_cache.invalidate('blockchain')
+
+cluster.add_listener(on_cluster_change)
+
+@app.get("/api/aether/alerts")
+async def query_alerts(severity: Optional[str] = None, type: Optional[str] = None,
+                       vehicle_id: Optional[str] = None, since: Optional[str] = None,
+                       until: Optional[str] = None, cursor: Optional[int] = None, limit: int = 50):
+    """Recorded emergency alerts, newest first. `since`/`until` take ISO times or epoch
+    seconds; pass the returned `next_cursor` as `cursor` for the next page."""
+    try:
+        page = alert_store.query(severity, type, vehicle_id, since, until, cursor, limit)
+    except ValueError as e:
+        return NegotiatedResponse({'error': f"Invalid time filter: {str(e)[:100]}"}, status_code=400)
+    page['stats'] = alert_store.get_stats()
+    return page
+
+@app.get("/api/aether/cluster-status")
+async def get_cluster_status():
+    return cluster.get_stats()
+
+@app.get("/api/aether/startup-report")
+async def get_startup_report():
+    """Per-component build and start times from the application lifespan"""
+    return components.get_report()
+
+@app.get("/api/aether/load-status")
+async def get_load_status():
+    """Event loop lag and the current load shedding level"""
+    return load_shedder.get_stats()
+
+@app.get("/api/aether/debug/blocking")
+async def get_blocking_report(limit: int = 20, reset: bool = False):
+    """Stalls caught by the blocking-call detector (start with AETHER_DEBUG_BLOCKING=1)"""
+    report = blocking_detector.get_report(limit)
+    if reset:
+        blocking_detector.reset()
+    return report
+
+@app.get("/api/aether/ws-connections")
+async def get_ws_connections():
+    return manager.get_stats()
+
+@app.get("/api/aether/cache-stats")
+async def get_cache_stats():
+    return response_cache.get_stats()
+
+@app.get("/api/aether/coalescing-stats")
+async def get_coalescing_stats():
+    return request_coalescer.get_stats()
+
+def _coalescing_samples(field: str) -> Dict[tuple, int]:
+    return {(name,): stats[field] for name, stats in request_coalescer.get_stats()['keys'].items()}
+
+metrics_registry.callback('aether_ws_active_connections', 'Connected WebSocket clients',
+                          lambda: len(manager.sessions))
+metrics_registry.callback('aether_ws_queue_depth', 'Frames waiting in WebSocket send queues',
+                          lambda: sum(session.queue_depth() for session in manager.sessions.values()))
+metrics_registry.callback('aether_ws_evictions_total', 'WebSocket clients evicted for exceeding their send budget',
+                          lambda: manager.evictions, metric_type='counter')
+metrics_registry.callback('aether_response_cache_hits_total', 'Response cache hits',
+                          lambda: response_cache.hits, metric_type='counter')
+metrics_registry.callback('aether_response_cache_misses_total', 'Response cache misses',
+                          lambda: response_cache.misses, metric_type='counter')
+metrics_registry.callback('aether_response_cache_not_modified_total', '304 responses served from the cache',
+                          lambda: response_cache.not_modified, metric_type='counter')
+metrics_registry.callback('aether_coalesced_calls_total', 'Calls routed through the request coalescer',
+                          lambda: _coalescing_samples('calls'), ('name',), metric_type='counter')
+metrics_registry.callback('aether_coalesced_executions_total', 'Computations actually run by the request coalescer',
+                          lambda: _coalescing_samples('executions'), ('name',), metric_type='counter')
+metrics_registry.callback('aether_blockchain_height', 'Blocks in the AETHER chain',
+                          lambda: len(aether_blockchain.chain))
+metrics_registry.callback('aether_alert_store_size', 'Emergency alerts retained in the alert store',
+                          lambda: len(alert_store))
+metrics_registry.callback('aether_cluster_is_leader', '1 if this worker runs the simulations',
+                          lambda: int(cluster.is_leader))
+
+@app.get("/metrics")
+async def get_prometheus_metrics():
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
 
 @app.post("/startup")
 async def startup_endpoint():
     return {"status": "Backend is running", "timestamp": datetime.now().isoformat()}
 
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+async def websocket_endpoint(websocket: WebSocket, protocol: str = 'full', fields: Optional[str] = None):
+    """Snapshot stream. `?protocol=delta` sends a keyframe on connect and then
+    JSON-Patch style deltas against the last frame the client acknowledged
+    with {"type": "ack", "seq": N}; {"type": "keyframe_request"} forces a keyframe.
+
+    {"type": "subscribe", "topics": {"iot_sensors": 0.5, "fleet_management": 10}}
+    switches the connection to per-topic frames, each topic pushed at its own
+    interval in seconds. Topics are the `aether_data` keys; only subscribed
+    topics are computed.
+
+    Offering the `aether.msgpack` or `aether.cbor` subprotocol switches the
+    connection to binary frames in that encoding. Adding `+deflate` (e.g.
+    `aether.json+deflate`) makes every outbound frame a binary raw-DEFLATE
+    frame sharing one compression context per connection; append
+    00 00 ff ff before inflating, as in permessage-deflate.
+
+    `?fields=` takes the same dotted paths as /api/dynamic/full-system and
+    limits both the snapshot frames and what is computed for them; unknown
+    paths are ignored.
+
+    While the load shedder is at its highest level new connections are
+    closed with 1013 (Try Again Later) and a `retry-after=N` reason.
+    """
+    if not load_shedder.accepts_connections():
+        # 1013 Try Again Later; the reason carries the retry hint
+        load_shedder.rejected_connections += 1
+        await websocket.accept()
+        await websocket.close(code=1013, reason=f"overloaded; retry-after={load_shedder.retry_after}")
+        return
+    encoding, deflate = negotiate_ws_compression(websocket.scope.get('subprotocols', []))
+    await manager.connect(websocket, 'delta' if protocol == 'delta' else 'full', encoding, deflate,
+                          parse_fields(fields))
     try:
         while True:
-            data = await get_comprehensive_system_data()
-            await websocket.send_text(json.dumps(data))
-            await asyncio.sleep(1.5)
+            message = await websocket.receive()
+            if message['type'] == 'websocket.disconnect':
+                raise WebSocketDisconnect(message.get('code', 1000))
+            payload = message.get('text')
+            await manager.handle_client_message(websocket, payload if payload is not None else message.get('bytes', b''))
     except WebSocketDisconnect:
         manager.disconnect(websocket)
 
@@ -635,11 +1321,8 @@ if __name__ == "__main__":
     print(f"API Docs: http://localhost:8000/docs")
     print("=" * 80)
     
-    # Start IoT monitoring
-    iot_manager.start_monitoring()
-    print("IoT sensors initialized")
-    
     # Start frontend automatically after a delay
     threading.Timer(3.0, start_frontend).start()
     
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
\ No newline at end of file
+    # Transport-level permessage-deflate for browsers that offer it
+    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info", ws_per_message_deflate=True)
\ No newline at end of file
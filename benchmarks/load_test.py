@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+AETHER System - Load Test & Latency Benchmark
+Drives concurrent load against every REST route while N WebSocket subscribers
+listen on /ws, then reports throughput, p50/p95/p99 latency, frame
+inter-arrival jitter and server CPU.
+
+Runs against the app in-process (ASGI, no network) or a running uvicorn:
+
+    python benchmarks/load_test.py --duration 20 --concurrency 64 --ws-clients 50
+    python benchmarks/load_test.py --url http://localhost:8000 --server-pid 1234
+    python benchmarks/load_test.py --spawn --output after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+import psutil
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# The proof route needs a seq (or block_index/position) query and answers 400 without one
+SKIPPED_ROUTES = {"/", "/metrics", "/api/aether/blockchain/proof"}
+SAMPLE_PATH_PARAMS = {"vehicle_id": "AETHER_VEHICLE_001"}
+# Fallback for path parameters without a sample, by OpenAPI schema type
+SAMPLE_TYPE_DEFAULTS = {"integer": 1, "number": 1}
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+def summarize_latencies(latencies: List[float]) -> Dict[str, float]:
+    return {
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'max_ms': round(max(latencies) * 1000, 2) if latencies else 0.0
+    }
+
+def routes_from_openapi(schema: Dict[str, Any]) -> List[str]:
+    routes = []
+    for path, operations in schema.get('paths', {}).items():
+        if 'get' not in operations or path in SKIPPED_ROUTES:
+            continue
+        values = {}
+        for parameter in operations['get'].get('parameters', []):
+            if parameter.get('in') != 'path':
+                continue
+            name = parameter['name']
+            value = SAMPLE_PATH_PARAMS.get(name, SAMPLE_TYPE_DEFAULTS.get(parameter.get('schema', {}).get('type')))
+            if value is None:
+                break
+            values[name] = value
+        else:
+            routes.append(path.format(**values))
+    return routes
+
+# --- In-process ASGI transport -------------------------------------------------
+
+class InProcessTarget:
+    """Talks to the ASGI app directly: no sockets, no HTTP parsing"""
+
+    def __init__(self, app):
+        self.app = app
+        self.client_ports = itertools.count(20000)
+        self._lifespan_queue: Optional[asyncio.Queue] = None
+        self._lifespan_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self._lifespan_queue = asyncio.Queue()
+        started = asyncio.Event()
+
+        async def send(message):
+            if message['type'] in ('lifespan.startup.complete', 'lifespan.startup.failed'):
+                started.set()
+
+        self._lifespan_task = asyncio.create_task(
+            self.app({'type': 'lifespan', 'asgi': {'version': '3.0'}}, self._lifespan_queue.get, send))
+        await self._lifespan_queue.put({'type': 'lifespan.startup'})
+        await started.wait()
+
+    async def stop(self):
+        await self._lifespan_queue.put({'type': 'lifespan.shutdown'})
+        await self._lifespan_task
+
+    def _scope(self, scope_type: str, path: str) -> Dict[str, Any]:
+        path, _, query = path.partition('?')
+        return {
+            'type': scope_type,
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'scheme': 'http' if scope_type == 'http' else 'ws',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query.encode(),
+            'root_path': '',
+            'headers': [(b'host', b'loadtest'), (b'accept', b'application/json')],
+            'client': ('127.0.0.1', next(self.client_ports)),
+            'server': ('loadtest', 80),
+            'subprotocols': []
+        }
+
+    async def openapi(self) -> Dict[str, Any]:
+        return self.app.openapi()
+
+    async def get(self, path: str) -> Tuple[int, int]:
+        scope = self._scope('http', path)
+        scope['method'] = 'GET'
+        done = asyncio.Event()
+        response = {'status': 0, 'bytes': 0}
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            await done.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+            elif message['type'] == 'http.response.body':
+                response['bytes'] += len(message.get('body', b''))
+                if not message.get('more_body'):
+                    done.set()
+
+        await self.app(scope, receive, send)
+        done.set()
+        return response['status'], response['bytes']
+
+    async def subscribe(self, path: str, on_frame: Callable[[Any], Optional[str]], stop: asyncio.Event):
+        inbound: asyncio.Queue = asyncio.Queue()
+        await inbound.put({'type': 'websocket.connect'})
+
+        async def send(message):
+            if message['type'] == 'websocket.send':
+                reply = on_frame(message.get('text') if message.get('text') is not None else message.get('bytes'))
+                if reply is not None:
+                    await inbound.put({'type': 'websocket.receive', 'text': reply})
+            elif message['type'] == 'websocket.close':
+                stop.set()
+
+        task = asyncio.create_task(self.app(self._scope('websocket', path), inbound.get, send))
+        await stop.wait()
+        await inbound.put({'type': 'websocket.disconnect', 'code': 1000})
+        await task
+
+# --- Network transport -----------------------------------------------------------
+
+class NetworkTarget:
+    """Talks to a running server over HTTP and WebSocket with aiohttp"""
+
+    def __init__(self, base_url: str, concurrency: int):
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = concurrency
+        self.session = None
+
+    async def start(self):
+        import aiohttp
+        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.concurrency * 2))
+
+    async def stop(self):
+        await self.session.close()
+
+    async def openapi(self) -> Dict[str, Any]:
+        async with self.session.get(f"{self.base_url}/openapi.json") as response:
+            return await response.json()
+
+    async def get(self, path: str) -> Tuple[int, int]:
+        async with self.session.get(f"{self.base_url}{path}") as response:
+            body = await response.read()
+            return response.status, len(body)
+
+    async def subscribe(self, path: str, on_frame: Callable[[Any], Optional[str]], stop: asyncio.Event):
+        ws_url = self.base_url.replace('http', 'ws', 1) + path
+        async with self.session.ws_connect(ws_url, max_msg_size=0) as ws:
+            receiver = asyncio.create_task(self._receive(ws, on_frame))
+            await stop.wait()
+            receiver.cancel()
+
+    async def _receive(self, ws, on_frame):
+        async for message in ws:
+            reply = on_frame(message.data)
+            if reply is not None:
+                await ws.send_str(reply)
+
+# --- Load generation -------------------------------------------------------------
+
+async def rest_worker(target, routes: List[str], deadline: float, results: Dict[str, Dict[str, Any]],
+                      offset: int):
+    for route in itertools.islice(itertools.cycle(routes), offset, None):
+        if time.perf_counter() >= deadline:
+            return
+        started = time.perf_counter()
+        try:
+            status, size = await target.get(route)
+        except Exception:
+            status, size = 0, 0
+        stats = results[route]
+        stats['latencies'].append(time.perf_counter() - started)
+        stats['bytes'] += size
+        if status not in (200, 304):
+            stats['errors'] += 1
+
+async def ws_subscriber(target, protocol: str, stop: asyncio.Event, arrivals: List[float], sizes: List[int]):
+    from delta_protocol import DeltaDecoder
+    decoder = DeltaDecoder()
+
+    def on_frame(payload) -> Optional[str]:
+        arrivals.append(time.perf_counter())
+        sizes.append(len(payload))
+        if protocol != 'delta':
+            return None
+        reply = decoder.apply(json.loads(payload))
+        return json.dumps(reply)
+
+    path = '/ws?protocol=delta' if protocol == 'delta' else '/ws'
+    try:
+        await target.subscribe(path, on_frame, stop)
+    except Exception as e:
+        print(f"WebSocket subscriber error: {e}")
+
+def summarize_websockets(all_arrivals: List[List[float]], sizes: List[int]) -> Dict[str, Any]:
+    intervals = []
+    for arrivals in all_arrivals:
+        intervals.extend(later - earlier for earlier, later in zip(arrivals, arrivals[1:]))
+    frames = sum(len(arrivals) for arrivals in all_arrivals)
+    return {
+        'clients': len(all_arrivals),
+        'frames': frames,
+        'avg_frame_bytes': round(sum(sizes) / len(sizes), 1) if sizes else 0,
+        'inter_arrival_mean_ms': round(statistics.mean(intervals) * 1000, 2) if intervals else 0.0,
+        'inter_arrival_jitter_ms': round(statistics.pstdev(intervals) * 1000, 2) if intervals else 0.0,
+        'inter_arrival_p99_ms': round(percentile(intervals, 99) * 1000, 2)
+    }
+
+async def run_load(target, args, server_process: Optional[psutil.Process]) -> Dict[str, Any]:
+    await target.start()
+    try:
+        routes = routes_from_openapi(await target.openapi())
+        if args.routes:
+            routes = [route for route in routes if any(route.startswith(prefix) for prefix in args.routes.split(','))]
+        results = {route: {'latencies': [], 'bytes': 0, 'errors': 0} for route in routes}
+
+        stop = asyncio.Event()
+        arrivals = [[] for _ in range(args.ws_clients)]
+        sizes: List[int] = []
+        subscribers = [asyncio.create_task(ws_subscriber(target, args.ws_protocol, stop, arrivals[i], sizes))
+                       for i in range(args.ws_clients)]
+
+        if server_process is not None:
+            server_process.cpu_percent(None)
+        wall_started = time.perf_counter()
+        deadline = wall_started + args.duration
+        await asyncio.gather(*(rest_worker(target, routes, deadline, results, i)
+                               for i in range(args.concurrency)))
+        elapsed = time.perf_counter() - wall_started
+        cpu_percent = server_process.cpu_percent(None) if server_process is not None else None
+
+        stop.set()
+        await asyncio.gather(*subscribers)
+    finally:
+        await target.stop()
+
+    rest = {}
+    for route, stats in results.items():
+        count = len(stats['latencies'])
+        rest[route] = {
+            'requests': count,
+            'errors': stats['errors'],
+            'throughput_rps': round(count / elapsed, 1),
+            'avg_bytes': round(stats['bytes'] / count, 1) if count else 0,
+            **summarize_latencies(stats['latencies'])
+        }
+    all_latencies = [latency for stats in results.values() for latency in stats['latencies']]
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'config': {
+            'target': args.url or 'in-process',
+            'duration_s': args.duration,
+            'concurrency': args.concurrency,
+            'ws_clients': args.ws_clients,
+            'ws_protocol': args.ws_protocol
+        },
+        'totals': {
+            'requests': len(all_latencies),
+            'errors': sum(stats['errors'] for stats in results.values()),
+            'throughput_rps': round(len(all_latencies) / elapsed, 1),
+            **summarize_latencies(all_latencies)
+        },
+        'rest': rest,
+        'websocket': summarize_websockets(arrivals, sizes),
+        # In-process runs measure this process, so the load generator is included
+        'server_cpu_percent': round(cpu_percent, 1) if cpu_percent is not None else None
+    }
+
+# --- Reporting -------------------------------------------------------------------
+
+def print_report(report: Dict[str, Any]):
+    print(f"\nTarget: {report['config']['target']}  duration: {report['config']['duration_s']}s  "
+          f"concurrency: {report['config']['concurrency']}  ws clients: {report['config']['ws_clients']}")
+    print("-" * 96)
+    print(f"{'route':<46}{'req':>8}{'err':>6}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for route, stats in sorted(report['rest'].items()):
+        print(f"{route:<46}{stats['requests']:>8}{stats['errors']:>6}{stats['throughput_rps']:>9}"
+              f"{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}")
+    totals = report['totals']
+    print("-" * 96)
+    print(f"{'TOTAL':<46}{totals['requests']:>8}{totals['errors']:>6}{totals['throughput_rps']:>9}"
+          f"{totals['p50_ms']:>9}{totals['p95_ms']:>9}{totals['p99_ms']:>9}")
+    ws = report['websocket']
+    print(f"\nWebSocket: {ws['clients']} clients, {ws['frames']} frames, avg {ws['avg_frame_bytes']} bytes, "
+          f"inter-arrival {ws['inter_arrival_mean_ms']} ms (jitter {ws['inter_arrival_jitter_ms']} ms, "
+          f"p99 {ws['inter_arrival_p99_ms']} ms)")
+    if report['server_cpu_percent'] is not None:
+        print(f"Server CPU: {report['server_cpu_percent']}%")
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """Routes whose p95 latency grew or throughput dropped by more than `threshold` (a fraction)"""
+    regressions = []
+    print(f"\nComparison against baseline from {baseline.get('timestamp', 'unknown')}:")
+    print(f"{'route':<46}{'p95 before':>12}{'p95 after':>12}{'rps before':>12}{'rps after':>12}")
+    for route, after in sorted(current['rest'].items()):
+        before = baseline.get('rest', {}).get(route)
+        if not before:
+            continue
+        print(f"{route:<46}{before['p95_ms']:>12}{after['p95_ms']:>12}"
+              f"{before['throughput_rps']:>12}{after['throughput_rps']:>12}")
+        if before['p95_ms'] and after['p95_ms'] > before['p95_ms'] * (1 + threshold):
+            regressions.append(f"{route}: p95 {before['p95_ms']} -> {after['p95_ms']} ms")
+        if before['throughput_rps'] and after['throughput_rps'] < before['throughput_rps'] * (1 - threshold):
+            regressions.append(f"{route}: throughput {before['throughput_rps']} -> {after['throughput_rps']} rps")
+    return regressions
+
+def spawn_server(port: int, workers: int = 1) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "universal_backend:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR
+    )
+    import urllib.request
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/api/dynamic/metrics", timeout=1)
+            return process
+        except Exception:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become ready")
+
+def main():
+    parser = argparse.ArgumentParser(description="AETHER load test and latency benchmark")
+    parser.add_argument("--url", help="base URL of a running server (default: in-process ASGI)")
+    parser.add_argument("--spawn", action="store_true", help="start a local uvicorn for the run")
+    parser.add_argument("--port", type=int, default=8765, help="port for --spawn")
+    parser.add_argument("--server-pid", type=int, help="pid of the server process to sample CPU from")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent REST workers")
+    parser.add_argument("--ws-clients", type=int, default=10, help="concurrent /ws subscribers")
+    parser.add_argument("--ws-protocol", choices=["full", "delta"], default="full")
+    parser.add_argument("--routes", help="comma-separated route prefixes to include")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="regression tolerance (fraction)")
+    args = parser.parse_args()
+
+    spawned = None
+    server_process = None
+    if args.spawn:
+        spawned = spawn_server(args.port)
+        args.url = f"http://127.0.0.1:{args.port}"
+        server_process = psutil.Process(spawned.pid)
+    elif args.server_pid:
+        server_process = psutil.Process(args.server_pid)
+
+    if args.url:
+        target = NetworkTarget(args.url, args.concurrency)
+    else:
+        from universal_backend import app
+        target = InProcessTarget(app)
+        server_process = psutil.Process(os.getpid())
+
+    try:
+        report = asyncio.run(run_load(target, args, server_process))
+    finally:
+        if spawned is not None:
+            spawned.terminate()
+            spawned.wait()
+
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.output}")
+
+    if args.compare:
+        regressions = compare_reports(json.loads(Path(args.compare).read_text()), report, args.threshold)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo regressions beyond threshold")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+AETHER System - Snapshot Serialization Benchmark
+Reports bytes and microseconds per snapshot for every available encoding
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from serialization import ENCODINGS, available_encodings, encode_stdlib_json, json_backend
+
+async def build_snapshot():
+    from universal_backend import get_comprehensive_system_data, metrics_sampler
+    metrics_sampler.start()
+    try:
+        return await get_comprehensive_system_data()
+    finally:
+        metrics_sampler.stop()
+
+def time_encoder(encoder, snapshot, iterations):
+    payload = encoder(snapshot)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        encoder(snapshot)
+    elapsed = time.perf_counter() - started
+    return len(payload), elapsed / iterations * 1_000_000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark snapshot serialization")
+    parser.add_argument("--iterations", type=int, default=500, help="encodes per encoding")
+    parser.add_argument("--json", dest="json_output", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    snapshot = asyncio.run(build_snapshot())
+
+    encoders = {'json-stdlib': encode_stdlib_json}
+    for name in available_encodings():
+        label = f"json-{json_backend()}" if name == 'json' else name
+        encoders[label] = ENCODINGS[name][2]
+
+    results = {}
+    print(f"{'encoding':<14}{'bytes':>10}{'us/snapshot':>14}")
+    print("-" * 38)
+    for label, encoder in encoders.items():
+        size, micros = time_encoder(encoder, snapshot, args.iterations)
+        results[label] = {'bytes': size, 'us_per_snapshot': round(micros, 1)}
+        print(f"{label:<14}{size:>10}{micros:>14.1f}")
+
+    missing = [name for name in ENCODINGS if name not in available_encodings()]
+    if missing:
+        print(f"\nNot installed: {', '.join(missing)}")
+
+    if args.json_output:
+        Path(args.json_output).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
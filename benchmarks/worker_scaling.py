@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+AETHER System - Worker Scaling Benchmark
+Starts uvicorn with 1, 2, 4... workers sharing a SQLite state backend and
+measures REST throughput at each worker count with the load test harness.
+
+    python benchmarks/worker_scaling.py --workers 1 2 4 --duration 10 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import load_test
+
+DEFAULT_ROUTES = "/api/dynamic/metrics,/api/aether/vehicle-health,/api/aether/swarm-status,/api/aether/blockchain"
+
+def run_at(workers: int, args, state_path: str) -> dict:
+    os.environ['AETHER_STATE_BACKEND'] = 'sqlite'
+    os.environ['AETHER_STATE_PATH'] = state_path
+    server = load_test.spawn_server(args.port, workers)
+    try:
+        # Give every worker time to finish its lifespan and the leader election to settle
+        time.sleep(args.warmup)
+        load_args = SimpleNamespace(url=f"http://127.0.0.1:{args.port}", duration=args.duration,
+                                    concurrency=args.concurrency, ws_clients=0, ws_protocol='full',
+                                    routes=args.routes)
+        target = load_test.NetworkTarget(load_args.url, args.concurrency)
+        report = asyncio.run(load_test.run_load(target, load_args, None))
+    finally:
+        server.terminate()
+        server.wait()
+    return {'workers': workers, **report['totals']}
+
+def main():
+    parser = argparse.ArgumentParser(description="AETHER requests/second versus uvicorn worker count")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--routes", default=DEFAULT_ROUTES, help="comma-separated route prefixes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds to wait after startup")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as state_dir:
+        for workers in args.workers:
+            results.append(run_at(workers, args, os.path.join(state_dir, f"state_{workers}.db")))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    baseline = results[0]['throughput_rps'] or 1
+    print(f"\n{'workers':>8}{'rps':>10}{'speedup':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for row in results:
+        print(f"{row['workers']:>8}{row['throughput_rps']:>10}{row['throughput_rps'] / baseline:>10.2f}"
+              f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}{row['errors']:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,20 @@ Tests all implemented features to ensure they work with real-time data
 """
 
 import asyncio
+import os
+import subprocess
+import sys
+import tempfile
 import requests
 import json
 import time
+import websockets
 from datetime import datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+from merkle import verify_record_proof
 
 class AETHERFeatureTester:
     def __init__(self):
@@ -61,6 +71,179 @@ class AETHERFeatureTester:
         
         return timestamp_found and real_data_found
     
+    def check_proof(self, seq):
+        """Fetch the inclusion proof for a receipt seq and verify it offline"""
+        response = requests.get(f"{self.base_url}/api/aether/blockchain/proof",
+                                params={"seq": seq}, timeout=10)
+        return response.status_code == 200 and verify_record_proof(response.json())['valid']
+    
+    def test_ingestion(self):
+        """Batch and NDJSON ingestion receipts, commit status and proofs"""
+        try:
+            records = [{"vehicle_id": f"TEST_BATCH_{i:03d}", "speed": 40 + i} for i in range(10)]
+            response = requests.post(f"{self.base_url}/api/aether/ingest/batch",
+                                     json=records, params={"wait": 5}, timeout=10)
+            receipt = response.json()
+            if response.status_code == 200 and receipt.get('accepted') == 10 \
+                    and receipt.get('commit', {}).get('status') == 'committed':
+                print("✅ Batch ingestion: PASS")
+                print(f"   Seqs: {receipt['first_seq']}-{receipt['last_seq']}")
+            else:
+                print(f"❌ Batch ingestion: FAIL ({response.status_code})")
+            
+            # One bad line is rejected without failing the rest of the stream
+            lines = [json.dumps({"vehicle_id": f"TEST_STREAM_{i:03d}", "speed": 60}) for i in range(5)]
+            body = "\n".join(lines + ["not json"]) + "\n"
+            response = requests.post(f"{self.base_url}/api/aether/ingest/stream", data=body.encode(),
+                                     headers={"Content-Type": "application/x-ndjson"},
+                                     params={"wait": 5}, timeout=10)
+            stream_receipt = response.json()
+            if response.status_code == 200 and stream_receipt.get('accepted') == 5 \
+                    and stream_receipt.get('rejected') == 1:
+                print("✅ NDJSON stream ingestion: PASS")
+            else:
+                print(f"❌ NDJSON stream ingestion: FAIL ({response.status_code})")
+            
+            seq = stream_receipt.get('last_seq')
+            response = requests.get(f"{self.base_url}/api/aether/ingest/status/{seq}", timeout=10)
+            if response.status_code == 200 and response.json().get('status') == 'committed':
+                print("✅ Ingestion commit status: PASS")
+            else:
+                print("❌ Ingestion commit status: FAIL")
+            
+            if self.check_proof(seq):
+                print("✅ Merkle inclusion proof: PASS")
+            else:
+                print("❌ Merkle inclusion proof: FAIL")
+        except Exception as e:
+            print(f"❌ Ingestion test error: {e}")
+    
+    def test_alert_paging(self):
+        """Alerts are recorded and can be paged with cursors"""
+        try:
+            for i in range(3):
+                requests.post(f"{self.base_url}/api/aether/emergency-alert",
+                              json={"type": "TEST_ALERT", "severity": "LOW", "vehicle_id": "TEST_VEHICLE_001",
+                                    "message": f"Paging check {i}"}, timeout=10)
+            response = requests.get(f"{self.base_url}/api/aether/alerts",
+                                    params={"type": "TEST_ALERT", "limit": 2}, timeout=10)
+            first_page = response.json()
+            cursor = first_page.get('next_cursor')
+            if response.status_code == 200 and first_page.get('count') == 2 and cursor is not None:
+                response = requests.get(f"{self.base_url}/api/aether/alerts",
+                                        params={"type": "TEST_ALERT", "limit": 2, "cursor": cursor}, timeout=10)
+                seen = {alert['seq'] for alert in first_page['alerts']}
+                second_page = response.json().get('alerts', [])
+                if second_page and not seen & {alert['seq'] for alert in second_page}:
+                    print("✅ Alert paging: PASS")
+                    print(f"   Retained alerts: {first_page['stats']['retained']}")
+                    return
+            print("❌ Alert paging: FAIL")
+        except Exception as e:
+            print(f"❌ Alert paging error: {e}")
+    
+    async def test_websocket_modes(self):
+        """Delta protocol (keyframe, ack, delta) and per-topic subscriptions"""
+        ws_url = self.base_url.replace("http", "ws", 1) + "/ws"
+        try:
+            async with websockets.connect(f"{ws_url}?protocol=delta") as websocket:
+                frame_types = []
+                while len(frame_types) < 3:
+                    frame = json.loads(await asyncio.wait_for(websocket.recv(), timeout=10))
+                    if frame.get('type') in ('keyframe', 'delta'):
+                        frame_types.append(frame['type'])
+                        await websocket.send(json.dumps({"type": "ack", "seq": frame['seq']}))
+                # Deltas that are not smaller than a keyframe go out as keyframes
+                if frame_types[0] == 'keyframe':
+                    print("✅ WebSocket delta mode: PASS")
+                    print(f"   Frames: {', '.join(frame_types)}")
+                else:
+                    print("❌ WebSocket delta mode: FAIL")
+            
+            async with websockets.connect(ws_url) as websocket:
+                await websocket.send(json.dumps({"type": "subscribe", "topics": {"iot_sensors": 0.5}}))
+                subscribed = topic_frame = None
+                while topic_frame is None:
+                    frame = json.loads(await asyncio.wait_for(websocket.recv(), timeout=10))
+                    if frame.get('type') == 'subscribed':
+                        subscribed = frame
+                    elif frame.get('type') == 'topic':
+                        topic_frame = frame
+                if subscribed and 'iot_sensors' in subscribed['topics'] and topic_frame['topic'] == 'iot_sensors':
+                    print("✅ WebSocket topic subscription: PASS")
+                else:
+                    print("❌ WebSocket topic subscription: FAIL")
+        except Exception as e:
+            print(f"❌ WebSocket test error: {e}")
+    
+    def test_response_cache(self):
+        """Cached GET routes answer a matching If-None-Match with 304"""
+        try:
+            response = requests.get(f"{self.base_url}/api/aether/quantum", timeout=10)
+            etag = response.headers.get('ETag')
+            response = requests.get(f"{self.base_url}/api/aether/quantum",
+                                    headers={"If-None-Match": etag or ""}, timeout=10)
+            if etag and response.status_code == 304:
+                print("✅ ETag revalidation (304): PASS")
+            else:
+                print(f"❌ ETag revalidation (304): FAIL ({response.status_code})")
+        except Exception as e:
+            print(f"❌ Response cache test error: {e}")
+    
+    def start_backend(self, port, ledger_dir):
+        env = {**os.environ, "AETHER_LEDGER_DIR": ledger_dir}
+        process = subprocess.Popen([sys.executable, "-m", "uvicorn", "universal_backend:app", "--port", str(port)],
+                                   cwd=BACKEND_DIR, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for _ in range(60):
+            try:
+                requests.get(f"http://localhost:{port}/api/aether/ingest/stats", timeout=1)
+                return process
+            except requests.RequestException:
+                time.sleep(0.5)
+        process.terminate()
+        raise RuntimeError(f"Backend on port {port} did not start")
+    
+    def test_ledger_restart(self, port=8011):
+        """A second backend on its own ledger keeps receipts and seqs across a restart"""
+        base_url = self.base_url
+        ledger_dir = tempfile.mkdtemp(prefix="aether-ledger-")
+        process = None
+        try:
+            process = self.start_backend(port, ledger_dir)
+            self.base_url = f"http://localhost:{port}"
+            response = requests.post(f"{self.base_url}/api/aether/store-vehicle-data",
+                                     json={"vehicle_id": "TEST_RESTART_001", "speed": 10},
+                                     params={"wait": 5}, timeout=10)
+            old_seq = response.json().get('seq')
+            process.terminate()
+            process.wait(timeout=30)
+            
+            process = self.start_backend(port, ledger_dir)
+            for _ in range(20):
+                response = requests.get(f"{self.base_url}/api/aether/blockchain/proof",
+                                        params={"seq": old_seq}, timeout=10)
+                if response.status_code != 503:  # still re-indexing the reopened ledger
+                    break
+                time.sleep(0.5)
+            new_seq = requests.post(f"{self.base_url}/api/aether/store-vehicle-data",
+                                    json={"vehicle_id": "TEST_RESTART_001", "speed": 20},
+                                    params={"wait": 5}, timeout=10).json().get('seq')
+            history = requests.get(f"{self.base_url}/api/aether/vehicle-history/TEST_RESTART_001",
+                                   timeout=10).json()
+            if self.check_proof(old_seq) and new_seq > old_seq and history.get('count') == 2:
+                print("✅ Ledger restart and reopen: PASS")
+                print(f"   Seq before restart: {old_seq}, after: {new_seq}")
+            else:
+                print("❌ Ledger restart and reopen: FAIL")
+        except Exception as e:
+            print(f"❌ Ledger restart test error: {e}")
+        finally:
+            self.base_url = base_url
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=30)
+    
     async def run_comprehensive_test(self):
         """Run comprehensive test of all AETHER features"""
         print("🌐 AETHER System - Comprehensive Feature Test")
@@ -82,6 +265,7 @@ class AETHERFeatureTester:
             ("/api/aether/emergency", "AI emergency response system"),
             ("/api/aether/fleet", "Universal fleet management"),
             ("/api/aether/blockchain", "Blockchain security status"),
+            ("/api/aether/blockchain/verification", "Ledger verification watermark"),
             ("/api/aether/quantum", "Quantum encryption status"),
             ("/api/aether/iot-sensors", "IoT sensor integration"),
             ("/api/aether/swarm-status", "Swarm intelligence coordination"),
@@ -121,8 +305,9 @@ class AETHERFeatureTester:
                 "timestamp": datetime.now().isoformat()
             }
             
+            # Records are sealed into blocks asynchronously; wait for this one
             response = requests.post(f"{self.base_url}/api/aether/store-vehicle-data", 
-                                   json=test_data, timeout=10)
+                                   json=test_data, params={"wait": 5}, timeout=10)
             if response.status_code == 200:
                 print("✅ Blockchain data storage: PASS")
                 
@@ -178,6 +363,31 @@ class AETHERFeatureTester:
         
         print()
         
+        print("Testing Ingestion and Proofs:")
+        print("-" * 30)
+        self.test_ingestion()
+        print()
+        
+        print("Testing Alert History:")
+        print("-" * 30)
+        self.test_alert_paging()
+        print()
+        
+        print("Testing WebSocket Streams:")
+        print("-" * 30)
+        await self.test_websocket_modes()
+        print()
+        
+        print("Testing Response Cache:")
+        print("-" * 30)
+        self.test_response_cache()
+        print()
+        
+        print("Testing Ledger Persistence:")
+        print("-" * 30)
+        self.test_ledger_restart()
+        print()
+        
         # Summary
         print("Test Summary:")
         print("=" * 30)